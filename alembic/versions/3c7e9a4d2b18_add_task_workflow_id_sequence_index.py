@@ -0,0 +1,28 @@
+"""add task workflow_id sequence index
+
+Revision ID: 3c7e9a4d2b18
+Revises: 1fb091960251
+Create Date: 2026-10-15 21:50:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e9a4d2b18'
+down_revision: Union[str, None] = '1fb091960251'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_task_workflow_id_sequence', 'tasks', ['workflow_id', 'sequence'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_workflow_id_sequence', table_name='tasks')
@@ -0,0 +1,30 @@
+"""cascade task workflow fk
+
+Revision ID: 8f2d61c0a5e7
+Revises: 3c7e9a4d2b18
+Create Date: 2026-10-15 22:04:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d61c0a5e7'
+down_revision: Union[str, None] = '3c7e9a4d2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('tasks_workflow_id_fkey', 'tasks', type_='foreignkey')
+    op.create_foreign_key('tasks_workflow_id_fkey', 'tasks', 'workflows', ['workflow_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('tasks_workflow_id_fkey', 'tasks', type_='foreignkey')
+    op.create_foreign_key('tasks_workflow_id_fkey', 'tasks', 'workflows', ['workflow_id'], ['id'])
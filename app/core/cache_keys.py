@@ -1,7 +1,19 @@
-import uuid
+from functools import lru_cache
 
-def workflow_cache_key(workflow_id: int | str) -> str:
-    return f"workflow:{workflow_id}"
+# Keys use short prefixes ("w:", "wl:") to keep per-entry overhead down.
+# Entries written under the old "workflow:" prefix are never read again;
+# drop them once after deploying, e.g.:
+#   redis-cli --scan --pattern 'workflow:*' | xargs -r redis-cli unlink
 
-def execution_cache_key(execution_id: str | uuid.UUID) -> str:
-    return f"execution:{execution_id}"
\ No newline at end of file
+# Bytes, memoized: hot ids reuse one key object, and the client sends bytes without encoding.
+@lru_cache(maxsize=4096)
+def workflow_cache_key(workflow_id: int | str) -> bytes:
+    return f"w:{workflow_id}".encode()
+
+# Bumped on every workflow write. Page keys embed it, so one INCR orphans every cached
+# page at once; orphans expire on their TTL. An old "wl:keys" set can be dropped with
+#   redis-cli unlink wl:keys
+WORKFLOW_LIST_GENERATION = "wl:gen"
+
+def workflow_list_cache_key(generation: int, skip: int, limit: int) -> str:
+    return f"wl:{generation}:{skip}:{limit}"
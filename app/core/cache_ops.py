@@ -0,0 +1,52 @@
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.core.cache_keys import workflow_cache_key, WORKFLOW_LIST_GENERATION
+
+
+def _is_unknown_command(error: ResponseError) -> bool:
+    return "unknown command" in str(error).lower()
+
+async def drop(redis_client: Redis, *keys: str | bytes) -> None:
+    """
+    Removes all `keys` with a single variadic UNLINK (one command, one round-trip).
+    UNLINK frees the values in a background thread on the Redis side; servers
+    older than 4.0 don't have it, so fall back to DEL there.
+    """
+    if not keys:
+        return
+    try:
+        await redis_client.unlink(*keys)
+    except ResponseError as e:
+        if not _is_unknown_command(e):
+            raise
+        await redis_client.delete(*keys)
+
+async def workflow_list_generation(redis_client: Redis) -> int:
+    """Current workflow list generation; 0 until the first write."""
+    return int(await redis_client.get(WORKFLOW_LIST_GENERATION) or 0)
+
+async def invalidate_workflow_cache(
+    redis_client: Redis,
+    workflow_id: int | str,
+    *,
+    lists: bool = False,
+) -> None:
+    """
+    Drops a workflow's cache entry in one round-trip.
+    With `lists=True` the list generation is bumped in the same pipeline, retiring every cached page.
+    """
+    key = workflow_cache_key(workflow_id)
+    if not lists:
+        await drop(redis_client, key)
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.unlink(key)
+        pipe.incr(WORKFLOW_LIST_GENERATION)
+        try:
+            await pipe.execute()
+        except ResponseError as e:
+            # Every queued command still ran, INCR included; only the UNLINK needs redoing as DEL.
+            if not _is_unknown_command(e):
+                raise
+            await redis_client.delete(key)
@@ -1,14 +1,46 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
 
     DATABASE_URL: str
     TEST_DATABASE_URL: str
     REDIS_URL: str
+    # Route tests FLUSHDB this; defaults to REDIS_URL's server on DB 15 (see test/conftest.py).
+    TEST_REDIS_URL: str | None = None
+
+    LOG_LEVEL: str = "INFO"
+
+    REDIS_MAX_CONNECTIONS: int = 50
+
+    WORKFLOW_CACHE_TTL: int = 3600
+    WORKFLOW_NOT_FOUND_CACHE_TTL: int = 30
+
+    MAX_CONCURRENT_TASKS: int = 32
+
+    GRPC_MAX_CONCURRENT_STREAMS: int = 1024
+    GRPC_KEEPALIVE_TIME_MS: int = 30000
+    # None leaves concurrent RPCs uncapped; set it only to shed load deliberately.
+    GRPC_MAX_CONCURRENT_RPCS: int | None = None
+
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_TIMEOUT: int = 10
+    DB_POOL_USE_LIFO: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 60000
+
+    model_config = SettingsConfigDict(
+        case_sensitive=True,
+        env_file=".env",
+        env_file_encoding="utf-8",
+    )
 
-    class Config:
-        case_sensitive = True
-        env_file = ".env"  # T
-        env_file_encoding = 'utf-8'
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Builds Settings once; `.env` and the environment are only read on the first call."""
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
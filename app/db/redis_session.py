@@ -1,21 +1,29 @@
+import logging
+
 import redis.asyncio as redis
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
-from app.core.config import settings
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
 
 redis_pool = None
+_shared_client: redis.Redis | None = None
 
 def setup_redis_pool():
-    """Initializes the Redis connection pool."""
-    global redis_pool
+    """Initializes the Redis connection pool and the shared client bound to it."""
+    global redis_pool, _shared_client
     if redis_pool is None:
-        print(f"--- Initializing Redis connection pool for URL: {settings.REDIS_URL} ---")
+        logger.info("Initializing Redis connection pool for URL: %s", get_settings().REDIS_URL)
         
+        # Cached values are JSON bytes handed straight to the HTTP response, so don't decode them.
         redis_pool = redis.ConnectionPool.from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True 
+            get_settings().REDIS_URL,
+            decode_responses=False,
+            max_connections=get_settings().REDIS_MAX_CONNECTIONS,
+            socket_keepalive=True,
         )
+        _shared_client = redis.Redis(connection_pool=redis_pool, single_connection_client=False)
     return redis_pool
 
 def get_redis_pool():
@@ -26,16 +34,23 @@ def get_redis_pool():
 
 async def close_redis_pool():
     """Closes the Redis connection pool."""
-    global redis_pool
+    global redis_pool, _shared_client
     if redis_pool:
-        print("--- Closing Redis connection pool ---")
+        logger.info("Closing Redis connection pool")
         await redis_pool.disconnect()
         redis_pool = None
+        _shared_client = None
 
 async def get_redis_client() -> redis.Redis:
-    """Dependency/getter for obtaining a Redis client from the pool."""
-    pool = get_redis_pool()
-    return redis.Redis(connection_pool=pool)
+    """
+    Dependency/getter for the process-wide Redis client.
+    The client is safe to share: each command checks a connection out of the pool.
+    Kept as a coroutine on purpose: FastAPI resolves async dependencies inline on the
+    event loop, whereas a plain `def` dependency is dispatched to the threadpool.
+    """
+    if _shared_client is None:
+        setup_redis_pool()
+    return _shared_client
 
 @asynccontextmanager
 async def redis_context() -> AsyncGenerator[redis.Redis, None]:
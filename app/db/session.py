@@ -1,44 +1,64 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings 
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, async_scoped_session, AsyncSession
+from app.core.config import get_settings
 from typing import AsyncGenerator
 from app.models.base import Base
 
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
 DATABASE_URL = settings.DATABASE_URL 
 
-engine = create_async_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Keepalives let the server notice dead peers, so recycling replaces pre-ping on the hot path.
+    connect_args={
+        "server_settings": {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            "tcp_keepalives_idle": "60",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "6",
+        }
+    },
+)
 
-AsyncSessionFactory = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
+AsyncSessionFactory = async_sessionmaker(
+    engine,
     expire_on_commit=False,
-    autoflush=False, 
-    autocommit=False 
+    autoflush=False,
 )
 
+# One session per asyncio task: re-entrant code in the same task shares it instead of
+# checking out a second connection. Callers must `await ScopedSession.remove()` when done.
+ScopedSession = async_scoped_session(AsyncSessionFactory, scopefunc=asyncio.current_task)
+
 async def init_db():
     """Placeholder for any initial DB setup (like creating tables with metadata)."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    print("--- Database Initialized (or connection pool ready) ---")
+    logger.info("Database initialized (or connection pool ready)")
 
 async def close_db():
     """Closes the database connection pool."""
     await engine.dispose()
-    print("--- Database Connection Pool Closed ---")
+    logger.info("Database connection pool closed")
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency that provides a database session per request.
+    Services commit their own writes, so read-only requests never issue a COMMIT;
+    anything left uncommitted is rolled back when the session closes.
+    No connection is checked out until the first query, so cache hits never touch the pool.
     Yields:
         AsyncSession: The database session.
     """
-    async_session: AsyncSession = AsyncSessionFactory()
-    try:
-        yield async_session 
-        await async_session.commit()
-    except Exception as e:
-        await async_session.rollback()
-        raise e
-    finally:
-        await async_session.close()
\ No newline at end of file
+    async with AsyncSessionFactory() as async_session:
+        yield async_session
\ No newline at end of file
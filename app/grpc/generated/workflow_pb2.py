@@ -24,23 +24,25 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0eworkflow.proto\x12\x08workflow\"-\n\x16\x45xecuteWorkflowRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\"\xb4\x01\n\x17WorkflowExecutionUpdate\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x02 \x01(\t\x12)\n\x06status\x18\x03 \x01(\x0e\x32\x19.workflow.ExecutionStatus\x12\x17\n\x0f\x63urrent_task_id\x18\x04 \x01(\t\x12\x19\n\x11\x63urrent_task_name\x18\x05 \x01(\t\x12\x0f\n\x07message\x18\x06 \x01(\t\"0\n\x18GetWorkflowStatusRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"\x84\x01\n\x16WorkflowStatusResponse\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x02 \x01(\t\x12)\n\x06status\x18\x03 \x01(\x0e\x32\x19.workflow.ExecutionStatus\x12\x14\n\x0clast_message\x18\x04 \x01(\t*m\n\x0f\x45xecutionStatus\x12\x16\n\x12STATUS_UNSPECIFIED\x10\x00\x12\x0b\n\x07PENDING\x10\x01\x12\x0b\n\x07RUNNING\x10\x02\x12\r\n\tCOMPLETED\x10\x03\x12\n\n\x06\x46\x41ILED\x10\x04\x12\r\n\tCANCELLED\x10\x05\x32\xc6\x01\n\x0fWorkflowService\x12X\n\x0f\x45xecuteWorkflow\x12 .workflow.ExecuteWorkflowRequest\x1a!.workflow.WorkflowExecutionUpdate0\x01\x12Y\n\x11GetWorkflowStatus\x12\".workflow.GetWorkflowStatusRequest\x1a .workflow.WorkflowStatusResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0eworkflow.proto\x12\x08workflow\"-\n\x16\x45xecuteWorkflowRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\"l\n\nTaskUpdate\x12)\n\x06status\x18\x01 \x01(\x0e\x32\x19.workflow.ExecutionStatus\x12\x0f\n\x07task_id\x18\x02 \x01(\t\x12\x11\n\ttask_name\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"\xe6\x01\n\x17WorkflowExecutionUpdate\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x02 \x01(\t\x12)\n\x06status\x18\x03 \x01(\x0e\x32\x19.workflow.ExecutionStatus\x12\x17\n\x0f\x63urrent_task_id\x18\x04 \x01(\t\x12\x19\n\x11\x63urrent_task_name\x18\x05 \x01(\t\x12\x0f\n\x07message\x18\x06 \x01(\t\x12*\n\x0ctask_updates\x18\t \x03(\x0b\x32\x14.workflow.TaskUpdateJ\x04\x08\x08\x10\t\"0\n\x18GetWorkflowStatusRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"\x84\x01\n\x16WorkflowStatusResponse\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x02 \x01(\t\x12)\n\x06status\x18\x03 \x01(\x0e\x32\x19.workflow.ExecutionStatus\x12\x14\n\x0clast_message\x18\x04 \x01(\t*m\n\x0f\x45xecutionStatus\x12\x16\n\x12STATUS_UNSPECIFIED\x10\x00\x12\x0b\n\x07PENDING\x10\x01\x12\x0b\n\x07RUNNING\x10\x02\x12\r\n\tCOMPLETED\x10\x03\x12\n\n\x06\x46\x41ILED\x10\x04\x12\r\n\tCANCELLED\x10\x05\x32\xc6\x01\n\x0fWorkflowService\x12X\n\x0f\x45xecuteWorkflow\x12 .workflow.ExecuteWorkflowRequest\x1a!.workflow.WorkflowExecutionUpdate0\x01\x12Y\n\x11GetWorkflowStatus\x12\".workflow.GetWorkflowStatusRequest\x1a .workflow.WorkflowStatusResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'workflow_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_EXECUTIONSTATUS']._serialized_start=443
-  _globals['_EXECUTIONSTATUS']._serialized_end=552
+  _globals['_EXECUTIONSTATUS']._serialized_start=603
+  _globals['_EXECUTIONSTATUS']._serialized_end=712
   _globals['_EXECUTEWORKFLOWREQUEST']._serialized_start=28
   _globals['_EXECUTEWORKFLOWREQUEST']._serialized_end=73
-  _globals['_WORKFLOWEXECUTIONUPDATE']._serialized_start=76
-  _globals['_WORKFLOWEXECUTIONUPDATE']._serialized_end=256
-  _globals['_GETWORKFLOWSTATUSREQUEST']._serialized_start=258
-  _globals['_GETWORKFLOWSTATUSREQUEST']._serialized_end=306
-  _globals['_WORKFLOWSTATUSRESPONSE']._serialized_start=309
-  _globals['_WORKFLOWSTATUSRESPONSE']._serialized_end=441
-  _globals['_WORKFLOWSERVICE']._serialized_start=555
-  _globals['_WORKFLOWSERVICE']._serialized_end=753
+  _globals['_TASKUPDATE']._serialized_start=75
+  _globals['_TASKUPDATE']._serialized_end=183
+  _globals['_WORKFLOWEXECUTIONUPDATE']._serialized_start=186
+  _globals['_WORKFLOWEXECUTIONUPDATE']._serialized_end=416
+  _globals['_GETWORKFLOWSTATUSREQUEST']._serialized_start=418
+  _globals['_GETWORKFLOWSTATUSREQUEST']._serialized_end=466
+  _globals['_WORKFLOWSTATUSRESPONSE']._serialized_start=469
+  _globals['_WORKFLOWSTATUSRESPONSE']._serialized_end=601
+  _globals['_WORKFLOWSERVICE']._serialized_start=715
+  _globals['_WORKFLOWSERVICE']._serialized_end=913
 # @@protoc_insertion_point(module_scope)
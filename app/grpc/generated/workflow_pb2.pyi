@@ -1,7 +1,8 @@
+from google.protobuf.internal import containers as _containers
 from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
@@ -26,21 +27,35 @@ class ExecuteWorkflowRequest(_message.Message):
     workflow_id: str
     def __init__(self, workflow_id: _Optional[str] = ...) -> None: ...
 
+class TaskUpdate(_message.Message):
+    __slots__ = ("status", "task_id", "task_name", "message")
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    TASK_NAME_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    status: ExecutionStatus
+    task_id: str
+    task_name: str
+    message: str
+    def __init__(self, status: _Optional[_Union[ExecutionStatus, str]] = ..., task_id: _Optional[str] = ..., task_name: _Optional[str] = ..., message: _Optional[str] = ...) -> None: ...
+
 class WorkflowExecutionUpdate(_message.Message):
-    __slots__ = ("execution_id", "workflow_id", "status", "current_task_id", "current_task_name", "message")
+    __slots__ = ("execution_id", "workflow_id", "status", "current_task_id", "current_task_name", "message", "task_updates")
     EXECUTION_ID_FIELD_NUMBER: _ClassVar[int]
     WORKFLOW_ID_FIELD_NUMBER: _ClassVar[int]
     STATUS_FIELD_NUMBER: _ClassVar[int]
     CURRENT_TASK_ID_FIELD_NUMBER: _ClassVar[int]
     CURRENT_TASK_NAME_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    TASK_UPDATES_FIELD_NUMBER: _ClassVar[int]
     execution_id: str
     workflow_id: str
     status: ExecutionStatus
     current_task_id: str
     current_task_name: str
     message: str
-    def __init__(self, execution_id: _Optional[str] = ..., workflow_id: _Optional[str] = ..., status: _Optional[_Union[ExecutionStatus, str]] = ..., current_task_id: _Optional[str] = ..., current_task_name: _Optional[str] = ..., message: _Optional[str] = ...) -> None: ...
+    task_updates: _containers.RepeatedCompositeFieldContainer[TaskUpdate]
+    def __init__(self, execution_id: _Optional[str] = ..., workflow_id: _Optional[str] = ..., status: _Optional[_Union[ExecutionStatus, str]] = ..., current_task_id: _Optional[str] = ..., current_task_name: _Optional[str] = ..., message: _Optional[str] = ..., task_updates: _Optional[_Iterable[_Union[TaskUpdate, _Mapping]]] = ...) -> None: ...
 
 class GetWorkflowStatusRequest(_message.Message):
     __slots__ = ("execution_id",)
@@ -1,213 +1,326 @@
 import asyncio
+import logging
 import uuid
-
-from app.db.redis_session import get_redis_client
-from redis.asyncio import Redis
-
-async def get_redis() -> Redis:
-  return await get_redis_client()
-
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import attrgetter
 
 from app.grpc.generated import workflow_pb2
 from app.grpc.generated import workflow_pb2_grpc
 import grpc
+from fastapi import HTTPException
 
-from app.db.session import AsyncSessionFactory 
+from app.core.config import settings
+from app.db.session import ScopedSession
 from app.models.enums import StatusEnum as AppStatusEnum 
 from app.services import workflow_service, workflow_execution_service 
 from app.models import Workflow, Task, WorkflowExecution 
 
+logger = logging.getLogger(__name__)
+
+# TaskUpdates queued within this window are sent as a single stream message.
+UPDATE_BATCH_WINDOW = 0.001
+
+_STATUS_MAP: dict[AppStatusEnum, workflow_pb2.ExecutionStatus] = {
+    AppStatusEnum.PENDING: workflow_pb2.PENDING,
+    AppStatusEnum.RUNNING: workflow_pb2.RUNNING,
+    AppStatusEnum.COMPLETED: workflow_pb2.COMPLETED,
+    AppStatusEnum.FAILED: workflow_pb2.FAILED,
+    AppStatusEnum.CANCELLED: workflow_pb2.CANCELLED,
+}
+
 def map_status_to_proto(app_status: AppStatusEnum) -> workflow_pb2.ExecutionStatus:
-    status_map = {
-        AppStatusEnum.PENDING: workflow_pb2.PENDING,
-        AppStatusEnum.RUNNING: workflow_pb2.RUNNING,
-        AppStatusEnum.COMPLETED: workflow_pb2.COMPLETED,
-        AppStatusEnum.FAILED: workflow_pb2.FAILED,
-        AppStatusEnum.CANCELLED: workflow_pb2.CANCELLED,
-    }
-    return status_map.get(app_status, workflow_pb2.STATUS_UNSPECIFIED)
+    return _STATUS_MAP.get(app_status, workflow_pb2.STATUS_UNSPECIFIED)
 
 async def execute_task_logic(task: Task, db_session) -> tuple[bool, str]:
     """
     Executes the actual logic for a single task.
     Returns (success_boolean, message_string).
     """
-    print(f"--- Executing Task: {task.id} - {task.name} (Execution Type: {task.execution_type}) ---")
+    logger.debug("Executing task %s - %s (execution type: %s)", task.id, task.name, task.execution_type)
 
     # Simulate task execution:
     await asyncio.sleep(1) # Simulate work
     success = True # Simulate task success
     message = f"Task {task.name} completed successfully." if success else f"Task {task.name} failed."
-    print(f"--- Finished Task: {task.id} - {task.name} ---")
+    logger.debug("Finished task %s - %s", task.id, task.name)
     return success, message
 
+async def _run_with_sem(sem: asyncio.Semaphore, coro):
+    """
+    Awaits `coro` once a slot in `sem` is free.
+    Exceptions are returned rather than raised so one failing task does not tear down its task group.
+    """
+    async with sem:
+        try:
+            return await coro
+        except Exception as e:
+            return e
+
+
+@dataclass
+class StatusBuffer:
+    """
+    Collects (status, message, task_id) transitions for an execution so they
+    can be persisted with one UPDATE instead of a write per transition.
+    """
+    persisted_status: AppStatusEnum
+    entries: list[tuple[AppStatusEnum, str | None, str | None]] = field(default_factory=list)
+
+    def add(self, status: AppStatusEnum, message: str | None = None, task_id: str | None = None) -> None:
+        self.entries.append((status, message, task_id))
+
+    @property
+    def dirty(self) -> bool:
+        """True when the buffered status differs from the one stored in the DB."""
+        return bool(self.entries) and self.entries[-1][0] != self.persisted_status
+
+    async def flush(self, execution_id: uuid.UUID) -> None:
+        if not self.entries:
+            return
+        status = self.entries[-1][0]
+        message = next((m for _, m, _ in reversed(self.entries) if m), None)
+        session = ScopedSession()
+        try:
+            await workflow_execution_service.set_execution_status(
+                db=session, execution_id=execution_id, status=status, message=message
+            )
+        finally:
+            await ScopedSession.remove()
+        self.persisted_status = status
+        self.entries.clear()
+
+
+def _task_update(status, message: str, task: Task | None = None) -> workflow_pb2.TaskUpdate:
+    if task is None:
+        return workflow_pb2.TaskUpdate(status=status, message=message)
+    return workflow_pb2.TaskUpdate(status=status, task_id=str(task.id), task_name=task.name, message=message)
+
+async def _drain(queue: asyncio.Queue):
+    """
+    Yields lists of queued TaskUpdates. After the first update arrives, waits one
+    UPDATE_BATCH_WINDOW so updates produced in quick succession share a batch.
+    Stops at the `None` sentinel.
+    """
+    while True:
+        first = await queue.get()
+        if first is None:
+            return
+        await asyncio.sleep(UPDATE_BATCH_WINDOW)
+        batch = [first]
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is None:
+                yield batch
+                return
+            batch.append(item)
+        yield batch
+
 
 class WorkflowServiceImpl(workflow_pb2_grpc.WorkflowServiceServicer):
 
     async def ExecuteWorkflow(self, request: workflow_pb2.ExecuteWorkflowRequest, context):
         """
         Triggers workflow execution and streams status updates.
+        Execution runs in a background task that queues TaskUpdates; the stream
+        sends everything queued within a 1 ms window as one message.
         """
         execution_id = uuid.uuid4()
-        print(f"Received request to execute workflow: {request.workflow_id}, Execution ID: {execution_id}")
-
-        async with AsyncSessionFactory() as session: 
-            try:
-                workflow_def: Workflow | None = await workflow_service.get_workflow(db=session, workflow_id=int(request.workflow_id)) # Assuming ID is int
-                if not workflow_def or not workflow_def.tasks:
-                    yield workflow_pb2.WorkflowExecutionUpdate(
-                        execution_id=str(execution_id),
-                        workflow_id=request.workflow_id,
-                        status=workflow_pb2.FAILED,
-                        message=f"Workflow definition '{request.workflow_id}' not found or has no tasks."
-                    )
-                    print(f"Execution {execution_id}: Workflow definition {request.workflow_id} not found or empty.")
+        logger.info("Received request to execute workflow %s, execution ID %s", request.workflow_id, execution_id)
+
+        queue: asyncio.Queue[workflow_pb2.TaskUpdate | None] = asyncio.Queue()
+        execution = asyncio.create_task(self._run_execution(request, execution_id, queue))
+        try:
+            # Each yield waits for the write to be accepted by the transport, so a slow
+            # reader backs up into `queue` rather than into gRPC's send buffers.
+            async for batch in _drain(queue):
+                if context.done():
+                    logger.info("Execution %s: client went away, stopping stream", execution_id)
                     return
-
-                execution_db = await workflow_execution_service.create_execution(
-                    db=session,
-                    workflow_definition_id=workflow_def.id,
-                    initial_status=AppStatusEnum.PENDING,
-                    execution_id=execution_id
-                )
-
+                latest = batch[-1]
                 yield workflow_pb2.WorkflowExecutionUpdate(
                     execution_id=str(execution_id),
                     workflow_id=request.workflow_id,
-                    status=workflow_pb2.PENDING,
-                    message="Workflow execution initiated."
+                    status=latest.status,
+                    current_task_id=latest.task_id,
+                    current_task_name=latest.task_name,
+                    message=latest.message,
+                    task_updates=batch,
                 )
+        finally:
+            if not execution.done():
+                execution.cancel()
 
-                execution_db = await workflow_execution_service.update_execution_status(
-                    db=session, execution_obj=execution_db, status=AppStatusEnum.RUNNING, message="Execution started."
-                )
-                yield workflow_pb2.WorkflowExecutionUpdate(
-                    execution_id=str(execution_id),
-                    workflow_id=request.workflow_id,
-                    status=workflow_pb2.RUNNING,
-                    message="Workflow execution started."
-                )
-                print(f"Execution {execution_id}: Status RUNNING")
-
-                tasks_by_sequence = {}
-                for task in sorted(workflow_def.tasks, key=lambda t: t.sequence):
-                    tasks_by_sequence.setdefault(task.sequence, []).append(task)
-
-                final_status = AppStatusEnum.COMPLETED
-                final_message = "Workflow completed successfully."
-
-                for sequence_num in sorted(tasks_by_sequence.keys()):
-                    tasks_in_sequence = tasks_by_sequence[sequence_num]
-                    print(f"Execution {execution_id}: Processing sequence {sequence_num}")
-
-                    async_tasks_coroutines = []
-                    sync_tasks = []
-
-                    for task in tasks_in_sequence:
-                        if task.execution_type == "async":
-                            async_tasks_coroutines.append(execute_task_logic(task, session))
-                        else:
-                            sync_tasks.append(task)
-
-                    # Execute synchronous tasks sequentially first
-                    for task in sync_tasks:
-                        yield workflow_pb2.WorkflowExecutionUpdate(
-                            execution_id=str(execution_id), workflow_id=request.workflow_id, status=workflow_pb2.RUNNING,
-                            current_task_id=str(task.id), current_task_name=task.name, message=f"Starting task {task.name}"
-                        )
-                        success, message = await execute_task_logic(task, session)
-                        yield workflow_pb2.WorkflowExecutionUpdate(
-                             execution_id=str(execution_id), workflow_id=request.workflow_id, status=workflow_pb2.RUNNING,
-                             current_task_id=str(task.id), current_task_name=task.name, message=message
-                        )
-                        if not success:
-                            final_status = AppStatusEnum.FAILED
-                            final_message = f"Workflow failed at task '{task.name}': {message}"
-                            print(f"Execution {execution_id}: Failed at sync task {task.name}")
-                            break 
-
-                    if final_status == AppStatusEnum.FAILED: break 
-
-                    # Execute asynchronous tasks concurrently (if any)
-                    if async_tasks_coroutines:
-                        yield workflow_pb2.WorkflowExecutionUpdate(
-                            execution_id=str(execution_id), workflow_id=request.workflow_id, status=workflow_pb2.RUNNING,
-                            message=f"Starting {len(async_tasks_coroutines)} parallel tasks for sequence {sequence_num}..."
-                        )
-                        results = await asyncio.gather(*async_tasks_coroutines, return_exceptions=True)
-
-                        for i, result in enumerate(results):
-                            task = next(t for t in tasks_in_sequence if t.execution_type == "async")
-                            if isinstance(result, Exception):
-                                success = False
-                                message = f"Parallel task '{task.name}' failed: {result}"
-                                final_status = AppStatusEnum.FAILED
-                                final_message = f"Workflow failed at parallel task '{task.name}': {result}"
-                                print(f"Execution {execution_id}: Failed at async task {task.name}")
-                            else:
-                                success, message = result
-
-                            yield workflow_pb2.WorkflowExecutionUpdate(
-                                execution_id=str(execution_id), workflow_id=request.workflow_id, status=workflow_pb2.RUNNING,
-                                current_task_id=str(task.id), current_task_name=task.name, message=message
-                            )
-                            if not success and final_status != AppStatusEnum.FAILED: 
-                                final_status = AppStatusEnum.FAILED
-                                final_message = f"Workflow failed at parallel task '{task.name}': {message}"
-                                print(f"Execution {execution_id}: Failed at async task {task.name}")
-
-                    if final_status == AppStatusEnum.FAILED: break 
-
-                await workflow_execution_service.update_execution_status(
-                    db=session, execution_obj=execution_db, status=final_status, message=final_message
-                )
-                yield workflow_pb2.WorkflowExecutionUpdate(
-                    execution_id=str(execution_id),
-                    workflow_id=request.workflow_id,
-                    status=map_status_to_proto(final_status),
-                    message=final_message
-                )
-                print(f"Execution {execution_id}: Final status {final_status.value}")
-
-            except Exception as e:
-                print(f"Execution {execution_id}: Unhandled exception: {e}")
-                try:
-                     if 'execution_db' in locals() and execution_db:
-                          await workflow_execution_service.update_execution_status(
-                              db=session, execution_obj=execution_db, status=AppStatusEnum.FAILED, message=f"Internal error: {e}"
+    async def _run_execution(self, request: workflow_pb2.ExecuteWorkflowRequest, execution_id: uuid.UUID, queue: asyncio.Queue) -> None:
+        """
+        Runs the workflow, queueing a TaskUpdate per step. Always terminates the
+        queue with `None`.
+        """
+        # Sessions are opened only around DB work so no pooled connection is held while tasks run.
+        execution_db: WorkflowExecution | None = None
+        try:
+            session = ScopedSession()
+            try:
+                workflow_def: Workflow | None = await workflow_service.get_workflow(db=session, workflow_id=int(request.workflow_id)) # Assuming ID is int
+                if workflow_def and workflow_def.tasks:
+                    execution_db = await workflow_execution_service.create_execution(
+                        db=session,
+                        workflow_definition_id=workflow_def.id,
+                        initial_status=AppStatusEnum.PENDING,
+                        execution_id=execution_id
+                    )
+            finally:
+                await ScopedSession.remove()
+
+            if execution_db is None:
+                queue.put_nowait(_task_update(
+                    workflow_pb2.FAILED,
+                    f"Workflow definition '{request.workflow_id}' not found or has no tasks."
+                ))
+                logger.warning("Execution %s: workflow definition %s not found or empty", execution_id, request.workflow_id)
+                return
+
+            status_buffer = StatusBuffer(persisted_status=AppStatusEnum.PENDING)
+
+            # The RUNNING write is deferred until just before the first task runs.
+            queue.put_nowait(_task_update(workflow_pb2.PENDING, "Workflow execution initiated."))
+            queue.put_nowait(_task_update(workflow_pb2.RUNNING, "Workflow execution started."))
+            status_buffer.add(AppStatusEnum.RUNNING, "Execution started.")
+            logger.debug("Execution %s: status RUNNING", execution_id)
+
+            final_status = AppStatusEnum.COMPLETED
+            final_message = "Workflow completed successfully."
+            task_slots = asyncio.Semaphore(settings.MAX_CONCURRENT_TASKS)
+
+            # Workflow.tasks is loaded ordered by sequence, so consecutive runs are the sequence groups.
+            for sequence_num, group in groupby(workflow_def.tasks, key=attrgetter("sequence")):
+                tasks_in_sequence = list(group)
+                logger.debug("Execution %s: processing sequence %s", execution_id, sequence_num)
+
+                async_tasks: list[Task] = []
+                sync_tasks = []
+
+                for task in tasks_in_sequence:
+                    if task.execution_type == "async":
+                        async_tasks.append(task)
+                    else:
+                        sync_tasks.append(task)
+
+                # Execute synchronous tasks sequentially first
+                for task in sync_tasks:
+                    queue.put_nowait(_task_update(workflow_pb2.RUNNING, f"Starting task {task.name}", task))
+                    if status_buffer.dirty:
+                        await status_buffer.flush(execution_id)
+
+                    # Simulated tasks don't touch the DB; DB-backed tasks should open their own session.
+                    success, message = await execute_task_logic(task, None)
+
+                    queue.put_nowait(_task_update(workflow_pb2.RUNNING, message, task))
+                    status_buffer.add(AppStatusEnum.RUNNING, message, str(task.id))
+                    if not success:
+                        final_status = AppStatusEnum.FAILED
+                        final_message = f"Workflow failed at task '{task.name}': {message}"
+                        logger.info("Execution %s: failed at sync task %s", execution_id, task.name)
+                        break 
+
+                if final_status == AppStatusEnum.FAILED: break 
+
+                # Execute asynchronous tasks concurrently (if any), at most MAX_CONCURRENT_TASKS at a time
+                if async_tasks:
+                    queue.put_nowait(_task_update(
+                        workflow_pb2.RUNNING,
+                        f"Starting {len(async_tasks)} parallel tasks for sequence {sequence_num}..."
+                    ))
+                    if status_buffer.dirty:
+                        await status_buffer.flush(execution_id)
+
+                    # Report each task as soon as it finishes; on the first failure cancel the rest.
+                    pending = {
+                        asyncio.create_task(_run_with_sem(task_slots, execute_task_logic(task, None))): task
+                        for task in async_tasks
+                    }
+                    try:
+                        while pending and final_status != AppStatusEnum.FAILED:
+                            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                            for run in done:
+                                task = pending.pop(run)
+                                result = run.result()
+                                if isinstance(result, Exception):
+                                    success, reason = False, result
+                                    message = f"Parallel task '{task.name}' failed: {result}"
+                                else:
+                                    success, message = result
+                                    reason = message
+
+                                queue.put_nowait(_task_update(workflow_pb2.RUNNING, message, task))
+                                status_buffer.add(AppStatusEnum.RUNNING, message, str(task.id))
+                                if not success and final_status != AppStatusEnum.FAILED:
+                                    final_status = AppStatusEnum.FAILED
+                                    final_message = f"Workflow failed at parallel task '{task.name}': {reason}"
+                                    logger.info("Execution %s: failed at async task %s", execution_id, task.name)
+                    finally:
+                        for run in pending:
+                            run.cancel()
+                        if pending:
+                            await asyncio.wait(pending)
+
+                if final_status == AppStatusEnum.FAILED: break 
+
+                # One write per sequence boundary, and only if the status actually moved.
+                if status_buffer.dirty:
+                    await status_buffer.flush(execution_id)
+
+            status_buffer.add(final_status, final_message)
+            await status_buffer.flush(execution_id)
+            queue.put_nowait(_task_update(map_status_to_proto(final_status), final_message))
+            logger.info("Execution %s: final status %s", execution_id, final_status.value)
+
+        except Exception as e:
+            logger.exception("Execution %s: unhandled exception", execution_id)
+            try:
+                 if execution_db:
+                      session = ScopedSession()
+                      try:
+                          await workflow_execution_service.set_execution_status(
+                              db=session, execution_id=execution_id, status=AppStatusEnum.FAILED, message=f"Internal error: {e}"
                           )
-                except Exception as db_err:
-                     print(f"Execution {execution_id}: Failed to update DB on error: {db_err}")
+                      finally:
+                          await ScopedSession.remove()
+            except Exception as db_err:
+                 logger.error("Execution %s: failed to update DB on error: %s", execution_id, db_err)
 
-                yield workflow_pb2.WorkflowExecutionUpdate(
-                    execution_id=str(execution_id),
-                    workflow_id=request.workflow_id,
-                    status=workflow_pb2.FAILED,
-                    message=f"Internal server error during execution: {e}"
-                )
+            queue.put_nowait(_task_update(workflow_pb2.FAILED, f"Internal server error during execution: {e}"))
+        finally:
+            queue.put_nowait(None)
 
 
     async def GetWorkflowStatus(self, request: workflow_pb2.GetWorkflowStatusRequest, context):
         """
         Gets the current status of a specific workflow execution.
         """
-        print(f"Received request for status of execution: {request.execution_id}")
-        async with AsyncSessionFactory() as session:
-            try:
-                execution_id_uuid = uuid.UUID(request.execution_id) 
-                execution_db: WorkflowExecution | None = await workflow_execution_service.get_execution(db=session, execution_id=execution_id_uuid)
-
-                if not execution_db:
-                     await context.abort(grpc.StatusCode.NOT_FOUND, f"Execution ID '{request.execution_id}' not found.")
-
-                return workflow_pb2.WorkflowStatusResponse(
-                    execution_id=str(execution_db.id),
-                    workflow_id=str(execution_db.workflow_definition_id), 
-                    status=map_status_to_proto(execution_db.status),
-                    last_message=execution_db.last_message or ""
-                )
-            except ValueError:
-                 await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Invalid Execution ID format: '{request.execution_id}'. Expected UUID.")
-            except Exception as e:
-                 print(f"Error fetching status for {request.execution_id}: {e}")
-                 await context.abort(grpc.StatusCode.INTERNAL, "Internal server error fetching status.")
\ No newline at end of file
+        logger.debug("Received request for status of execution %s", request.execution_id)
+        try:
+            execution_id_uuid = uuid.UUID(request.execution_id) 
+        except ValueError:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Invalid Execution ID format: '{request.execution_id}'. Expected UUID.")
+
+        # abort() raises, so it is only called from except blocks that can't catch it again.
+        session = ScopedSession()
+        try:
+            execution_db: WorkflowExecution = await workflow_execution_service.get_execution(db=session, execution_id=execution_id_uuid)
+        except HTTPException as e:
+            if e.status_code != 404:
+                raise
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Execution ID '{request.execution_id}' not found.")
+        except Exception:
+            logger.exception("Error fetching status for %s", request.execution_id)
+            await context.abort(grpc.StatusCode.INTERNAL, "Internal server error fetching status.")
+        finally:
+            await ScopedSession.remove()
+
+        return workflow_pb2.WorkflowStatusResponse(
+            execution_id=str(execution_db.id),
+            workflow_id=str(execution_db.workflow_definition_id), 
+            status=map_status_to_proto(execution_db.status),
+            last_message=execution_db.last_message or ""
+        )
@@ -1,20 +1,25 @@
 
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.core.config import get_settings
 from app.db.redis_session import setup_redis_pool, close_redis_pool
 from app.db.session import init_db, close_db
 from app.routes import workflows
 from app.routes import tasks 
 
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("--- Starting up ---")
+    logging.basicConfig(level=get_settings().LOG_LEVEL)
+    logger.info("Starting up")
     setup_redis_pool()
     await init_db()
     yield
-    print("--- Shutting down ---")
+    logger.info("Shutting down")
     await close_redis_pool()
     await close_db()
 
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLAlchemyEnum, JSON, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLAlchemyEnum, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base, TimestampMixin
 from .enums import StatusEnum, ExecutionTypeEnum
 class Task(Base, TimestampMixin):
     __tablename__ = "tasks"
+    # Serves tasks-by-workflow lookups in sequence order (Workflow.tasks, get_tasks_by_workflow) without a sort.
+    __table_args__ = (Index("ix_task_workflow_id_sequence", "workflow_id", "sequence"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
@@ -14,6 +16,6 @@ class Task(Base, TimestampMixin):
     status = Column(SQLAlchemyEnum(StatusEnum), default=StatusEnum.PENDING, nullable=False)
     config = Column(JSON, nullable=True) 
 
-    workflow_id = Column(Integer, ForeignKey("workflows.id"), nullable=False)
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False)
 
     workflow = relationship("Workflow", back_populates="tasks")
\ No newline at end of file
@@ -16,6 +16,7 @@ class Workflow(Base, TimestampMixin):
         "Task",
         back_populates="workflow",
         cascade="all, delete-orphan", 
+        passive_deletes=True, # the FK's ON DELETE CASCADE removes tasks
         order_by="Task.sequence",
-        lazy="selectin"
+        lazy="raise" # Load explicitly: selectinload() where tasks are needed, noload() where they aren't
     )
@@ -4,9 +4,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.redis_session import get_redis_client
 from redis.asyncio import Redis
 
-async def get_redis() -> Redis:
-  return await get_redis_client()
-
 from app import schemas
 from app import services
 from app.db.session import get_session
@@ -33,7 +30,7 @@ async def update_task(
     db: AsyncSession = Depends(get_session),
     task_id: int,
     task_in: schemas.TaskUpdate,
-    redis_client: Redis = Depends(get_redis),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Update a specific task.
@@ -49,7 +46,7 @@ async def delete_task(
     *,
     db: AsyncSession = Depends(get_session),
     task_id: int,
-    redis_client: Redis = Depends(get_redis),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Delete a specific task.
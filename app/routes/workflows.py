@@ -1,13 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.db.redis_session import get_redis_client
 from redis.asyncio import Redis
 
-async def get_redis() -> Redis:
-  return await get_redis_client()
-
 from app import schemas 
 from app import services
 from app.db.session import get_session
@@ -20,23 +17,27 @@ async def create_workflow(
     *,
     db: AsyncSession = Depends(get_session),
     workflow_in: schemas.WorkflowCreate,
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Create a new workflow.
     """
-    workflow = await services.workflow_service.create_workflow(db=db, obj_in=workflow_in)
+    workflow = await services.workflow_service.create_workflow(db=db, obj_in=workflow_in, redis_client=redis_client)
     return workflow
 
-@router.get("/", response_model=Page[schemas.Workflow])
+@router.get("/", response_model=Page[schemas.WorkflowSummary])
 async def read_workflows(
     db: AsyncSession = Depends(get_session),
     skip: int = 0,
     limit: int = Query(default=100, le=200),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
-    Retrieve workflows with their tasks.
+    Retrieve workflows (without their tasks; use GET /workflows/{id} for those).
     """
-    workflows = await services.workflow_service.get_workflows(db=db, skip=skip, limit=limit)
+    workflows = await services.workflow_service.get_workflows(db=db, skip=skip, limit=limit, redis_client=redis_client)
+    if isinstance(workflows, services.workflow_service.CachedJSON):
+        return Response(content=workflows.value, media_type="application/json")
     return workflows
 
 @router.get("/{workflow_id}", response_model=schemas.Workflow)
@@ -44,7 +45,7 @@ async def read_workflow(
     *,
     db: AsyncSession = Depends(get_session),
     workflow_id: int,
-    redis_client: Redis = Depends(get_redis),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Get a specific workflow by ID, including its tasks.
@@ -52,6 +53,8 @@ async def read_workflow(
     db_workflow = await services.workflow_service.get_workflow(db=db, workflow_id=workflow_id, redis_client=redis_client)
     if not db_workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
+    if isinstance(db_workflow, services.workflow_service.CachedJSON):
+        return Response(content=db_workflow.value, media_type="application/json")
     return db_workflow
 
 @router.put("/{workflow_id}", response_model=schemas.Workflow)
@@ -60,12 +63,13 @@ async def update_workflow(
     db: AsyncSession = Depends(get_session),
     workflow_id: int,
     workflow_in: schemas.WorkflowUpdate,
-    redis_client: Redis = Depends(get_redis),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Update a workflow.
     """
-    db_workflow = await services.workflow_service.get_workflow(db=db, workflow_id=workflow_id, redis_client=redis_client)
+    # Bypass the cache: a cache hit is serialized JSON, not an ORM object we can update.
+    db_workflow = await services.workflow_service.get_workflow(db=db, workflow_id=workflow_id)
     if not db_workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
     updated_workflow = await services.workflow_service.update_workflow(
@@ -78,7 +82,7 @@ async def delete_workflow(
     *,
     db: AsyncSession = Depends(get_session),
     workflow_id: int,
-    redis_client: Redis = Depends(get_redis),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Delete a workflow and its associated tasks.
@@ -97,13 +101,12 @@ async def create_task_for_workflow(
     db: AsyncSession = Depends(get_session),
     workflow_id: int,
     task_in: schemas.TaskCreateNested,
-    redis_client: Redis = Depends(get_redis),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     """
     Create a task associated with a specific workflow.
     """
-    db_workflow = await services.workflow_service.get_workflow(db=db, workflow_id=workflow_id, redis_client=redis_client)
-    if not db_workflow:
+    if not await services.workflow_service.workflow_exists(db=db, workflow_id=workflow_id):
         raise HTTPException(status_code=404, detail="Parent workflow not found")
 
     task = await services.task_service.create_workflow_task(
@@ -118,13 +121,11 @@ async def read_workflow_tasks(
     workflow_id: int,
     skip: int = 0,
     limit: int = Query(default=100, le=200),
-    redis_client: Redis = Depends(get_redis),
 ):
     """
     Retrieve tasks for a specific workflow.
     """
-    db_workflow = await services.workflow_service.get_workflow(db=db, workflow_id=workflow_id, redis_client=redis_client)
-    if not db_workflow:
+    if not await services.workflow_service.workflow_exists(db=db, workflow_id=workflow_id):
         raise HTTPException(status_code=404, detail="Parent workflow not found")
 
     tasks = await services.task_service.get_tasks_by_workflow(
@@ -1,3 +1,3 @@
 from .enums import StatusEnum
 from .task import Task, TaskCreate, TaskUpdate, TaskCreateNested
-from .workflow import Workflow, WorkflowCreate, WorkflowUpdate
\ No newline at end of file
+from .workflow import Workflow, WorkflowSummary, WorkflowCreate, WorkflowUpdate
\ No newline at end of file
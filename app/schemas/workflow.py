@@ -16,11 +16,13 @@ class WorkflowUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[StatusEnum] = None
 
-class Workflow(WorkflowBase):
+class WorkflowSummary(WorkflowBase):
     id: int
     status: StatusEnum
     created_at: datetime
     updated_at: Optional[datetime] = None
-    tasks: List[Task] = [] 
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class Workflow(WorkflowSummary):
+    tasks: List[Task] = []  
\ No newline at end of file
@@ -1,15 +1,24 @@
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 
 from fastapi import HTTPException
 
 from redis.asyncio import Redis 
 from app.core.cache_keys import workflow_cache_key
+from app.core.cache_ops import invalidate_workflow_cache
 
 from app.models.task import Task
 from app.schemas.task import TaskCreate, TaskUpdate, TaskCreateNested
-from app.services.workflow_service import get_workflow
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL SQLSTATE for foreign_key_violation
+FOREIGN_KEY_VIOLATION = "23503"
 
 async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
     query = select(Task).where(Task.id == task_id)
@@ -22,22 +31,25 @@ async def get_tasks_by_workflow(db: AsyncSession, workflow_id: int, skip: int =
     return result.scalars().all()
 
 async def create_task(db: AsyncSession, *, obj_in: TaskCreate, redis_client: Redis | None = None) -> Task:
-    workflow = await get_workflow(db, obj_in.workflow_id)
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Parent workflow not found")
-    db_obj = Task(**obj_in.model_dump())
-    db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    # No existence pre-check: the workflow_id foreign key rejects unknown parents.
+    stmt = insert(Task).values(**obj_in.model_dump()).returning(Task)
+    try:
+        db_obj = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if getattr(e.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+            raise HTTPException(status_code=404, detail="Parent workflow not found")
+        raise
 
     # --- Invalidate PARENT Workflow Cache ---
     if redis_client:
         cache_key = workflow_cache_key(obj_in.workflow_id)
         try:
-            await redis_client.delete(cache_key)
-            print(f"Invalidated parent workflow cache for key {cache_key} due to task creation")
+            await invalidate_workflow_cache(redis_client, obj_in.workflow_id)
+            logger.debug("Invalidated parent workflow cache for key %s due to task creation", cache_key)
         except Exception as e:
-            print(f"Redis DELETE error for key {cache_key}: {e}")
+            logger.warning("Redis DELETE error for key %s: %s", cache_key, e)
     # --- End Invalidation ---
 
     return db_obj
@@ -48,19 +60,18 @@ async def create_workflow_task(
     workflow_id: int,
     redis_client: Redis | None = None 
 ) -> Task:
-    db_obj = Task(**obj_in.model_dump(), workflow_id=workflow_id)
-    db.add(db_obj)
+    stmt = insert(Task).values(**obj_in.model_dump(), workflow_id=workflow_id).returning(Task)
+    db_obj = (await db.execute(stmt)).scalar_one()
     await db.commit()
-    await db.refresh(db_obj)
 
     # --- Invalidate PARENT Workflow Cache ---
     if redis_client:
         cache_key = workflow_cache_key(workflow_id)
         try:
-            await redis_client.delete(cache_key)
-            print(f"Invalidated parent workflow cache for key {cache_key} due to task creation")
+            await invalidate_workflow_cache(redis_client, workflow_id)
+            logger.debug("Invalidated parent workflow cache for key %s due to task creation", cache_key)
         except Exception as e:
-            print(f"Redis DELETE error for key {cache_key}: {e}")
+            logger.warning("Redis DELETE error for key %s: %s", cache_key, e)
     # --- End Invalidation ---
 
     return db_obj
@@ -78,20 +89,22 @@ async def update_task(
     parent_workflow_id = db_obj.workflow_id
 
     update_data = obj_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    db.add(db_obj)
-    await db.commit() 
-    await db.refresh(db_obj) 
+    if not update_data:
+        return db_obj
+
+    # The returned row refreshes db_obj in the identity map (including updated_at).
+    stmt = update(Task).where(Task.id == db_obj.id).values(**update_data).returning(Task)
+    db_obj = (await db.execute(stmt)).scalar_one()
+    await db.commit()
 
     # --- Invalidate PARENT Workflow Cache ---
     if redis_client and parent_workflow_id is not None:
         cache_key = workflow_cache_key(parent_workflow_id)
         try:
-            await redis_client.delete(cache_key)
-            print(f"Invalidated parent workflow cache for key {cache_key} due to task update")
+            await invalidate_workflow_cache(redis_client, parent_workflow_id)
+            logger.debug("Invalidated parent workflow cache for key %s due to task update", cache_key)
         except Exception as e:
-            print(f"Redis DELETE error during task update for key {cache_key}: {e}")
+            logger.warning("Redis DELETE error during task update for key %s: %s", cache_key, e)
     # --- End Invalidation ---
 
     return db_obj
@@ -116,11 +129,11 @@ async def delete_task(
         if redis_client and parent_workflow_id is not None:
             cache_key = workflow_cache_key(parent_workflow_id)
             try:
-                await redis_client.delete(cache_key)
-                print(f"Invalidated parent workflow cache for key {cache_key} due to task deletion")
+                await invalidate_workflow_cache(redis_client, parent_workflow_id)
+                logger.debug("Invalidated parent workflow cache for key %s due to task deletion", cache_key)
             except Exception as e:
                  # Log Redis errors but don't let them break the main operation
-                print(f"Redis DELETE error during task deletion for key {cache_key}: {e}")
+                logger.warning("Redis DELETE error during task deletion for key %s: %s", cache_key, e)
         # --- End Invalidation ---
 
         return db_obj 
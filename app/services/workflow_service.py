@@ -1,97 +1,206 @@
+import logging
+from dataclasses import dataclass
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload 
-from sqlalchemy import func
+from sqlalchemy.orm import selectinload, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, insert, delete, case, cast, literal, literal_column, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from typing import Optional
 
+from pydantic import TypeAdapter
+
 from redis.asyncio import Redis 
-from app.core.cache_keys import workflow_cache_key
+from app.core.config import settings
+from app.core.cache_keys import workflow_cache_key, workflow_list_cache_key
+from app.core.cache_ops import (
+    invalidate_workflow_cache,
+    workflow_list_generation,
+)
 
 from app.models.workflow import Workflow
+from app.models.task import Task
 from app.schemas.workflow import WorkflowCreate, WorkflowUpdate
-from app.schemas.workflow import Workflow as WorkflowSchema 
+from app.schemas.workflow import WorkflowSummary
 from app.schemas.pagination import Page 
 
 
+logger = logging.getLogger(__name__)
+
+# Cached in place of a workflow's JSON when the id doesn't exist.
+_NOT_FOUND = b"__NULL__"
+
+# dump_json on an adapter yields bytes straight from pydantic-core, with no intermediate str.
+_workflow_page_adapter = TypeAdapter(Page[WorkflowSummary])
+
+
+@dataclass(frozen=True, slots=True)
+class CachedJSON:
+    """Serialized Workflow response read from the cache, to be sent to the client as-is."""
+    value: str | bytes
+
+
+def _enum_value(column):
+    # Enum columns store member names (PENDING); the API uses the values (pending).
+    # Mapped member by member, so values needn't be the lowercased names.
+    return case(*((column == member, member.value) for member in column.type.enum_class))
+
+def _iso_utc(column):
+    # Renders timestamps the way pydantic does (UTC, "Z" suffix, fraction only when non-zero),
+    # independent of the session TimeZone. timezone('UTC', x) is x AT TIME ZONE 'UTC'.
+    utc = func.timezone("UTC", column)
+    return case(
+        (func.to_char(utc, "US") == "000000", func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS"Z"')),
+        else_=func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'),
+    )
+
+def _workflow_json_query(workflow_id: int):
+    """
+    SELECT producing the schemas.Workflow JSON for one workflow as text,
+    with tasks ordered by sequence as in Workflow.tasks.
+    """
+    task_json = func.json_build_object(
+        "name", Task.name,
+        "execution_type", _enum_value(Task.execution_type),
+        "description", Task.description,
+        "sequence", Task.sequence,
+        "config", Task.config,
+        "id", Task.id,
+        "workflow_id", Task.workflow_id,
+        "status", _enum_value(Task.status),
+        "created_at", _iso_utc(Task.created_at),
+        "updated_at", _iso_utc(Task.updated_at),
+    )
+    tasks_json = (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(task_json, Task.sequence, Task.id)),
+            literal_column("'[]'::json"),
+        ))
+        .where(Task.workflow_id == Workflow.id)
+        .scalar_subquery()
+    )
+    workflow_json = func.json_build_object(
+        "name", Workflow.name,
+        "description", Workflow.description,
+        "id", Workflow.id,
+        "status", _enum_value(Workflow.status),
+        "created_at", _iso_utc(Workflow.created_at),
+        "updated_at", _iso_utc(Workflow.updated_at),
+        "tasks", tasks_json,
+    )
+    return select(cast(workflow_json, Text)).where(Workflow.id == workflow_id)
+
+
 async def get_workflow(
     db: AsyncSession,
     workflow_id: int,
     redis_client: Redis | None = None
-) -> Workflow | None: 
+) -> Workflow | CachedJSON | None:
     """
     Gets a workflow, checking cache first.
-    Returns the ORM model. Caching uses the Schema representation.
+    With a redis_client the result is CachedJSON: the cached payload on a hit,
+    or JSON built by Postgres (and then cached) on a miss. Without one, the ORM
+    model is returned; use that when the object is needed (e.g. to modify it).
     """
     cache_key = workflow_cache_key(workflow_id)
-    cached_workflow_json: str | None = None
+    cached_workflow_json: bytes | None = None
 
     if redis_client:
         try:
             cached_workflow_json = await redis_client.get(cache_key)
         except Exception as e:
-            print(f"Redis GET error for key {cache_key}: {e}") 
+            logger.warning("Redis GET error for key %s: %s", cache_key, e)
             
+    if cached_workflow_json == _NOT_FOUND:
+        logger.debug("Cache HIT (not found) for key %s", cache_key)
+        return None
     if cached_workflow_json:
-        print(f"Cache HIT for key {cache_key}")
-        try:
-            workflow_schema = WorkflowSchema.model_validate_json(cached_workflow_json)
-            return workflow_schema 
-
-        except Exception as e:
-            print(f"Error deserializing cached workflow {cache_key}: {e}")
-            await redis_client.delete(cache_key)
-
+        logger.debug("Cache HIT for key %s", cache_key)
+        return CachedJSON(cached_workflow_json)
 
-    print(f"Cache MISS or bypass for key {cache_key}")
-    query = select(Workflow).where(Workflow.id == workflow_id).options(selectinload(Workflow.tasks))
-    result = await db.execute(query)
-    db_workflow = result.scalar_one_or_none()
+    logger.debug("Cache MISS or bypass for key %s", cache_key)
 
-    if not redis_client:
-        print("redis client not found")
-
-    if db_workflow and redis_client:
+    if redis_client:
+        # Let Postgres build the response JSON so a miss skips ORM loading and Pydantic entirely.
+        workflow_json = (await db.execute(_workflow_json_query(workflow_id))).scalar_one_or_none()
+        # Misses are cached briefly too, so repeated lookups of a missing id don't all reach the DB.
+        if workflow_json is None:
+            value_to_cache, ttl = _NOT_FOUND, settings.WORKFLOW_NOT_FOUND_CACHE_TTL
+        else:
+            value_to_cache, ttl = workflow_json, settings.WORKFLOW_CACHE_TTL
         try:
-            workflow_to_cache = WorkflowSchema.model_validate(db_workflow)
-            value_to_cache = workflow_to_cache.model_dump_json()
-
             await redis_client.set(
                 cache_key,
                 value_to_cache,
+                ex=ttl,
             )
-            print(f"Cached data for key {cache_key}")
+            logger.debug("Cached data for key %s", cache_key)
         except Exception as e:
-             print(f"Redis SET error for key {cache_key}: {e}") 
+            logger.warning("Redis SET error for key %s: %s", cache_key, e)
+        return CachedJSON(workflow_json) if workflow_json is not None else None
 
-    return db_workflow 
+    query = select(Workflow).where(Workflow.id == workflow_id).options(selectinload(Workflow.tasks))
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
 
-async def get_workflows(db: AsyncSession, skip: int = 0, limit: int = 100) -> Page[WorkflowSchema]:
+async def workflow_exists(db: AsyncSession, workflow_id: int) -> bool:
+    """Primary-key lookup that loads nothing; use instead of get_workflow for existence checks."""
+    query = select(literal(1)).where(Workflow.id == workflow_id)
+    return (await db.execute(query)).scalar() is not None
+
+async def get_workflows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    redis_client: Redis | None = None
+) -> Page[WorkflowSummary] | CachedJSON:
     """
     Retrieve a paginated list of workflows.
+    Tasks are not loaded; fetch a single workflow to get them.
+    With a redis_client, pages are cached per (generation, skip, limit) and a
+    hit is returned as CachedJSON.
     """
     if skip < 0:
         skip = 0
     if limit <= 0:
         limit = 100
 
-    count_query = select(func.count(Workflow.id))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one() 
+    cache_key = None
+    if redis_client:
+        try:
+            # Read before querying: a page built from pre-write rows lands under the old generation.
+            cache_key = workflow_list_cache_key(await workflow_list_generation(redis_client), skip, limit)
+            cached_page_json = await redis_client.get(cache_key)
+            if cached_page_json:
+                return CachedJSON(cached_page_json)
+        except Exception as e:
+            logger.warning("Redis GET error for workflow list page (%s, %s): %s", skip, limit, e)
 
+    # count() OVER () returns the unpaginated total on every row, so one query gives both.
     items_query = (
-        select(Workflow)
+        select(Workflow, func.count().over().label("total"))
         .offset(skip)
         .limit(limit)
-        .options(selectinload(Workflow.tasks)) 
+        .options(noload(Workflow.tasks)) 
         .order_by(Workflow.id) 
     )
-    items_result = await db.execute(items_query)
-    items = items_result.scalars().all()
+    rows = (await db.execute(items_query)).all()
+    items = [row.Workflow for row in rows]
 
-    page = (skip // limit) + 1 if limit > 0 else 1
-    pages = (total + limit - 1) // limit if limit > 0 else (1 if total > 0 else 0)
+    if rows:
+        total = rows[0].total
+    elif skip > 0:
+        # Past the last page there are no rows to carry the total; count separately.
+        total = (await db.execute(select(func.count(Workflow.id)))).scalar_one()
+    else:
+        total = 0
 
-    return Page[WorkflowSchema](
+    # limit is clamped positive above; -(-a // b) is ceil division.
+    page = skip // limit + 1
+    pages = -(-total // limit)
+
+    result_page = Page[WorkflowSummary](
         items=items,
         page=page,
         size=limit,
@@ -99,12 +208,39 @@ async def get_workflows(db: AsyncSession, skip: int = 0, limit: int = 100) -> Pa
         pages=pages
     )
 
-async def create_workflow(db: AsyncSession, *, obj_in: WorkflowCreate) -> Workflow:
-    db_obj = Workflow(**obj_in.model_dump()) 
-    db.add(db_obj)
+    if cache_key:
+        try:
+            await redis_client.set(
+                cache_key, _workflow_page_adapter.dump_json(result_page), ex=settings.WORKFLOW_CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning("Redis SET error for key %s: %s", cache_key, e)
+
+    return result_page
+
+async def create_workflow(
+    db: AsyncSession, *,
+    obj_in: WorkflowCreate,
+    redis_client: Redis | None = None
+) -> Workflow:
+    # RETURNING hands back the generated id and defaults without a follow-up SELECT.
+    stmt = insert(Workflow).values(**obj_in.model_dump()).returning(Workflow)
+    db_obj = (await db.execute(stmt)).scalar_one()
     await db.commit()
-    await db.refresh(db_obj)
-    # await db.refresh(db_obj, attribute_names=['tasks'])
+    # A new workflow has no tasks yet; mark the collection loaded instead of querying for it.
+    set_committed_value(db_obj, "tasks", [])
+
+    # --- Invalidate Cache ---
+    # Clears the list pages and any not-found entry cached for the new id.
+    if redis_client:
+        cache_key = workflow_cache_key(db_obj.id)
+        try:
+            await invalidate_workflow_cache(redis_client, db_obj.id, lists=True)
+            logger.debug("Invalidated cache for key %s", cache_key)
+        except Exception as e:
+            logger.warning("Redis DELETE error for key %s: %s", cache_key, e)
+    # --- End Invalidation ---
+
     return db_obj
 
 async def update_workflow(
@@ -118,17 +254,24 @@ async def update_workflow(
         setattr(db_obj, field, value)
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
-    await db.refresh(db_obj, attribute_names=['tasks'])
+    # One SELECT reloads the server-set columns and the tasks for the response; populate_existing
+    # overwrites a tasks collection the session already holds (e.g. the [] set on create).
+    reload_query = (
+        select(Workflow)
+        .where(Workflow.id == db_obj.id)
+        .options(selectinload(Workflow.tasks))
+        .execution_options(populate_existing=True)
+    )
+    db_obj = (await db.execute(reload_query)).scalar_one()
 
     # --- Invalidate Cache ---
     if redis_client:
         cache_key = workflow_cache_key(db_obj.id)
         try:
-            await redis_client.delete(cache_key)
-            print(f"Invalidated cache for key {cache_key}")
+            await invalidate_workflow_cache(redis_client, db_obj.id, lists=True)
+            logger.debug("Invalidated cache for key %s", cache_key)
         except Exception as e:
-            print(f"Redis DELETE error for key {cache_key}: {e}")
+            logger.warning("Redis DELETE error for key %s: %s", cache_key, e)
     # --- End Invalidation ---
 
     return db_obj
@@ -138,19 +281,25 @@ async def delete_workflow(
     workflow_id: int,
     redis_client: Redis | None = None 
 ) -> Optional[Workflow]:
-    db_obj = await get_workflow(db, workflow_id, redis_client=None) 
+    # Nothing is loaded first. Tasks are deleted explicitly, rather than left to the FK's
+    # ON DELETE CASCADE, so their RETURNING rows can fill the response's tasks.
+    task_stmt = delete(Task).where(Task.workflow_id == workflow_id).returning(Task)
+    deleted_tasks = (await db.execute(task_stmt)).scalars().all()
+    stmt = delete(Workflow).where(Workflow.id == workflow_id).returning(Workflow)
+    db_obj = (await db.execute(stmt)).scalar_one_or_none()
     if db_obj:
-        await db.delete(db_obj)
         await db.commit()
+        # RETURNING has no order; match Workflow.tasks (by sequence).
+        set_committed_value(db_obj, "tasks", sorted(deleted_tasks, key=lambda task: (task.sequence, task.id)))
 
         # --- Invalidate Cache ---
         if redis_client:
             cache_key = workflow_cache_key(workflow_id)
             try:
-                await redis_client.delete(cache_key)
-                print(f"Invalidated cache for key {cache_key}")
+                await invalidate_workflow_cache(redis_client, workflow_id, lists=True)
+                logger.debug("Invalidated cache for key %s", cache_key)
             except Exception as e:
-                print(f"Redis DELETE error for key {cache_key}: {e}")
+                logger.warning("Redis DELETE error for key %s: %s", cache_key, e)
         # --- End Invalidation ---
 
         return db_obj
@@ -1,18 +1,40 @@
 # run_grpc_server.py (place in project root or scripts/)
 import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import grpc
 import logging
+from google.protobuf.internal import api_implementation
 
 # Import generated code and service implementation
 from app.grpc.generated import workflow_pb2_grpc
+from app.core.config import get_settings
 from app.grpc.server import WorkflowServiceImpl
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=get_settings().LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 async def serve() -> None:
-    server = grpc.aio.server()
+    # protobuf >= 4.21 ships the native upb runtime by default; the pure-Python
+    # fallback makes every streamed WorkflowExecutionUpdate far more expensive.
+    if api_implementation.Type() == "python":
+        logger.warning(
+            "protobuf is using the pure-Python implementation; unset "
+            "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION or install a binary protobuf wheel"
+        )
+
+    settings = get_settings()
+    server = grpc.aio.server(
+        migration_thread_pool=ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2),
+        options=[
+            ("grpc.max_concurrent_streams", settings.GRPC_MAX_CONCURRENT_STREAMS),
+            ("grpc.so_reuseport", 1),
+            ("grpc.keepalive_time_ms", settings.GRPC_KEEPALIVE_TIME_MS),
+        ],
+        maximum_concurrent_rpcs=settings.GRPC_MAX_CONCURRENT_RPCS,
+    )
     workflow_pb2_grpc.add_WorkflowServiceServicer_to_server(
         WorkflowServiceImpl(), server
     )
@@ -30,6 +52,9 @@ async def serve() -> None:
         logger.info("Server stopped.")
 
 if __name__ == "__main__":
+    if sys.platform != "win32":
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(serve())
     except Exception as e:
@@ -1,14 +1,18 @@
 import asyncio
 from typing import AsyncGenerator, Generator
+from urllib.parse import urlsplit
 
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from redis.asyncio import Redis
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.main import app  
 from app.db.session import get_session 
+from app.db.redis_session import get_redis_client
 from app.models.base import Base  
 from app.core.config import settings
 
@@ -19,10 +23,10 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     yield loop
     loop.close()
 
+# NullPool: every checkout opens a fresh connection, so nothing is left pooled between tests.
 test_engine = create_async_engine(
     str(settings.TEST_DATABASE_URL), 
-    pool_pre_ping=True,
-
+    poolclass=NullPool,
 )
 
 TestSessionFactory = async_sessionmaker(
@@ -33,17 +37,26 @@ TestSessionFactory = async_sessionmaker(
     autocommit=False
 )
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def clean_db_per_function():
+def _test_redis_url() -> str:
+    """
+    TEST_REDIS_URL, or REDIS_URL's server on DB 15.
+    Tests flush this database, so it must never be the one the app serves from.
     """
-    Drops and recreates all tables for EACH test function, ensuring a clean state.
-    Relies on pytest-asyncio for event loop management.
+    url = settings.TEST_REDIS_URL or urlsplit(settings.REDIS_URL)._replace(path="/15").geturl()
+    if url == settings.REDIS_URL:
+        raise RuntimeError("TEST_REDIS_URL must differ from REDIS_URL: route tests flush it")
+    return url
+
+@pytest_asyncio.fixture(scope="session")
+async def create_schema():
+    """
+    Drops and recreates all tables once per test session, the first time a test needs the DB.
+    Tests are isolated by transaction rollback (see `session_override`), not by DDL.
     """
     async with test_engine.begin() as conn:
-        
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
-    
+
     yield
 
 
@@ -56,36 +69,53 @@ async def engine_lifecycle():
     await test_engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def session_override(clean_db_per_function): 
+@pytest_asyncio.fixture(scope="function")
+async def session_override(create_schema): 
     """
-    Provides a session for each test function, overriding the `get_session` dependency.
-    Ensures operations within a single test occur within a transaction that gets rolled back.
-    Runs *after* clean_db_per_function due to dependency.
+    Provides a session for each test function, overriding the `get_session` dependency,
+    and points `get_redis_client` at the test Redis DB.
+    Requested by `client`; tests that don't hit the app skip the DB setup entirely.
+    The session is bound to a connection inside an outer transaction; service-level
+    commits only release SAVEPOINTs, and the outer transaction is rolled back afterwards.
     """
-    async with TestSessionFactory() as session:
-        await session.begin_nested()
+    async with test_engine.connect() as connection:
+        outer_transaction = await connection.begin()
+        session = TestSessionFactory(bind=connection, join_transaction_mode="create_savepoint")
+
+        # The app's Redis is shared with running services; point the app at a dedicated test DB.
+        redis_client = Redis.from_url(_test_redis_url(), decode_responses=False)
 
         async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
              yield session
 
-        original_override = app.dependency_overrides.get(get_session)
+        async def override_get_redis_client() -> Redis:
+             return redis_client
+
+        original_overrides = {
+            dependency: app.dependency_overrides.get(dependency)
+            for dependency in (get_session, get_redis_client)
+        }
         app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_redis_client] = override_get_redis_client
 
         yield
 
-        if original_override:
-             app.dependency_overrides[get_session] = original_override
-        else:
-             if get_session in app.dependency_overrides:
-                 del app.dependency_overrides[get_session]
+        for dependency, original_override in original_overrides.items():
+            if original_override:
+                 app.dependency_overrides[dependency] = original_override
+            else:
+                 app.dependency_overrides.pop(dependency, None)
+
+        await session.close()
+        await outer_transaction.rollback()
 
-        if session.is_active:
-            await session.rollback()
+        # Rolled-back rows may still be cached; drop the test cache so the next test starts clean.
+        await redis_client.flushdb()
+        await redis_client.aclose()
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client() -> AsyncGenerator[AsyncClient, None]:
+async def client(session_override) -> AsyncGenerator[AsyncClient, None]:
     """
     Provides an HTTPX AsyncClient for making requests to the test app.
     """
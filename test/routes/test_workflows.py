@@ -83,6 +83,36 @@ async def test_read_workflow_found(client: AsyncClient):
     assert data["name"] == workflow.name
     assert data["tasks"] == [] 
 
+@pytest.mark.asyncio
+async def test_read_workflow_matches_write_responses(client: AsyncClient):
+    """
+    Test that GET, served as JSON built by Postgres and then from the cache, returns
+    exactly the body POST/PUT produced through the response model for the same row.
+    """
+    create_response = await client.post("/workflows/", json={"name": "WF Same Body", "description": "d"})
+    assert create_response.status_code == 201
+    workflow_id = create_response.json()["id"]
+
+    for _ in range(2): # Cache miss, then cache hit
+        response = await client.get(f"/workflows/{workflow_id}")
+        assert response.status_code == 200
+        assert response.json() == create_response.json()
+
+    task_response = await client.post(
+        f"/workflows/{workflow_id}/tasks/",
+        json={"name": "Task", "sequence": 1, "execution_type": "async", "config": {"retries": 2}}
+    )
+    assert task_response.status_code == 201
+    task_update = await client.put(f"/tasks/{task_response.json()['id']}", json={"status": StatusEnum.RUNNING.value})
+    assert task_update.status_code == 200 # Sets the task's updated_at
+    update_response = await client.put(f"/workflows/{workflow_id}", json={"status": StatusEnum.RUNNING.value})
+    assert update_response.status_code == 200
+
+    for _ in range(2):
+        response = await client.get(f"/workflows/{workflow_id}")
+        assert response.status_code == 200
+        assert response.json() == update_response.json()
+
 @pytest.mark.asyncio
 async def test_read_workflow_not_found(client: AsyncClient):
     """Test reading a specific workflow that does not exist."""
@@ -103,8 +133,12 @@ async def test_update_workflow(client: AsyncClient):
     assert data["name"] == update_data["name"]
     assert data["status"] == update_data["status"]
     assert data["description"] == workflow.description 
-    assert "updated_at" in data
-    assert data["updated_at"] != data["created_at"]
+    # Tests share one outer transaction, where now() is fixed: check the update set the
+    # column, not that the clock moved.
+    updated = schemas.Workflow(**data)
+    assert workflow.updated_at is None # Not set until the first update
+    assert updated.updated_at is not None
+    assert updated.updated_at >= updated.created_at
 
     response_get = await client.get(f"/workflows/{workflow.id}")
     assert response_get.status_code == 200
@@ -122,12 +156,19 @@ async def test_update_workflow_not_found(client: AsyncClient):
 async def test_delete_workflow(client: AsyncClient):
     """Test deleting an existing workflow."""
     workflow = await create_test_workflow(client, "WF To Delete")
+    for sequence in (2, 1):
+        task_response = await client.post(
+            f"/workflows/{workflow.id}/tasks/",
+            json={"name": f"Task {sequence}", "sequence": sequence, "execution_type": "sync"}
+        )
+        assert task_response.status_code == 201
 
     response = await client.delete(f"/workflows/{workflow.id}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == workflow.id
     assert data["name"] == workflow.name
+    assert [task["sequence"] for task in data["tasks"]] == [1, 2] # The deleted tasks, in order
 
     response_get = await client.get(f"/workflows/{workflow.id}")
     assert response_get.status_code == 404
@@ -0,0 +1,9 @@
+import pytest
+
+from .fakes import FakeAsyncSession
+
+
+@pytest.fixture
+def mock_db_session() -> FakeAsyncSession:
+    """Provides a fake AsyncSession."""
+    return FakeAsyncSession()
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+
+class FakeAsyncSession:
+    """
+    Stand-in for AsyncSession exposing only what the services call.
+    Cheaper than AsyncMock(spec=AsyncSession), which introspects the whole session API.
+    """
+
+    def __init__(self):
+        self.execute = AsyncMock()
+        self.add = MagicMock()
+        self.commit = AsyncMock()
+        self.refresh = AsyncMock()
+        self.delete = AsyncMock()
+        self.rollback = AsyncMock()
+
+
+# Result stand-ins for session.execute. SimpleNamespace attribute access is a plain
+# dict lookup, where MagicMock builds child mocks on first access.
+
+def scalar_result(value):
+    """Result whose scalar accessors all return value."""
+    return SimpleNamespace(
+        scalar=lambda: value,
+        scalar_one=lambda: value,
+        scalar_one_or_none=lambda: value,
+    )
+
+def scalars_result(items):
+    """Result whose .scalars().all() returns items."""
+    return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: items))
+
+def rows_result(rows):
+    """Result whose .all() returns rows."""
+    return SimpleNamespace(all=lambda: rows)
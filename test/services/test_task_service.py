@@ -1,10 +1,10 @@
 # tests/test_task_service.py
 
 import pytest
-import pytest_asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
 
 from app.services import task_service
 from app.models.task import Task as TaskModel
@@ -14,16 +14,20 @@ from app.models.enums import StatusEnum, ExecutionTypeEnum
 from datetime import datetime
 from typing import List
 
-@pytest.fixture
-def mock_db_session():
-    """Provides a mocked AsyncSession."""
-    session = AsyncMock(spec=AsyncSession)
-    session.execute = AsyncMock() 
-    session.add = MagicMock()     
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-    session.delete = AsyncMock()
-    return session
+from .fakes import scalar_result, scalars_result
+
+# Deterministic timestamp for ORM fixtures; avoids a clock read per object.
+_FIXED_NOW = datetime(2024, 1, 1, 0, 0, 0)
+
+# Validated once; tests that only read the schema share it.
+SAMPLE_TASK_CREATE = TaskCreate(
+    name="Standalone Task",
+    execution_type=ExecutionTypeEnum.SYNC,
+    description="Created via TaskCreate",
+    sequence=5,
+    workflow_id=7,
+    config={"key": "value"}
+)
 
 def create_mock_task(
     id: int,
@@ -41,147 +45,131 @@ def create_mock_task(
         status=status,
         sequence=sequence,
         config=kwargs.get("config"),
-        created_at=kwargs.get("created_at", datetime.now()),
+        created_at=kwargs.get("created_at", _FIXED_NOW),
         updated_at=kwargs.get("updated_at")
     )
 
 
-@pytest.mark.asyncio
-async def test_get_task_found(mock_db_session: AsyncMock):
-    """Test retrieving an existing task by ID."""
-    task_id = 10
-    workflow_id = 1
-    mock_task_orm = create_mock_task(id=task_id, workflow_id=workflow_id)
-
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_task_orm
-    mock_db_session.execute.return_value = mock_result
+# Shared read-only samples; tests that mutate tasks build their own with create_mock_task.
+@pytest.fixture(scope="module")
+def sample_task() -> TaskModel:
+    return create_mock_task(id=10, workflow_id=1)
 
-    result = await task_service.get_task(mock_db_session, task_id=task_id)
-
-    assert result is not None
-    assert result.id == task_id
-    assert result.workflow_id == workflow_id
+@pytest.fixture(scope="module")
+def sample_tasks() -> tuple[TaskModel, ...]:
+    return (
+        create_mock_task(id=1, workflow_id=5, sequence=1),
+        create_mock_task(id=2, workflow_id=5, sequence=2),
+    )
 
-    mock_db_session.execute.assert_called_once()
-    call_args = mock_db_session.execute.call_args[0][0]
-    assert str(call_args).startswith("SELECT tasks.id")
-    assert task_id in call_args.compile().params.values()
 
-@pytest.mark.asyncio
-async def test_get_task_not_found(mock_db_session: AsyncMock):
-    """Test retrieving a non-existent task by ID."""
-    task_id = 999
+@pytest.mark.parametrize("found", [True, False])
+async def test_get_task(mock_db_session: AsyncMock, sample_task: TaskModel, found: bool):
+    """Test retrieving a task by ID, existing or not."""
+    task_id = sample_task.id
+    workflow_id = sample_task.workflow_id
+    mock_task_orm = sample_task if found else None
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_db_session.execute.return_value = mock_result
+    mock_db_session.execute.return_value = scalar_result(mock_task_orm)
 
     result = await task_service.get_task(mock_db_session, task_id=task_id)
 
-    assert result is None
     mock_db_session.execute.assert_called_once()
+    if not found:
+        assert result is None
+        return
 
-@pytest.mark.asyncio
-async def test_get_tasks_by_workflow_found(mock_db_session: AsyncMock):
-    """Test retrieving tasks for a specific workflow."""
-    workflow_id = 5
-    skip = 0
-    limit = 10
-    mock_task1 = create_mock_task(id=1, workflow_id=workflow_id, sequence=1)
-    mock_task2 = create_mock_task(id=2, workflow_id=workflow_id, sequence=2)
-    mock_tasks_orm: List[TaskModel] = [mock_task1, mock_task2]
-
-    mock_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = mock_tasks_orm
-    mock_result.scalars.return_value = mock_scalars
-    mock_db_session.execute.return_value = mock_result
-
-    result = await task_service.get_tasks_by_workflow(
-        mock_db_session, workflow_id=workflow_id, skip=skip, limit=limit
-    )
-
-    assert isinstance(result, list)
-    assert len(result) == 2
-    assert result[0].id == 1
-    assert result[1].id == 2
-    assert all(t.workflow_id == workflow_id for t in result)
+    assert result is not None
+    assert result.id == task_id
+    assert result.workflow_id == workflow_id
 
-    mock_db_session.execute.assert_called_once()
     call_args = mock_db_session.execute.call_args[0][0]
-    compiled_query = call_args.compile(compile_kwargs={"literal_binds": True})
+    compiled_query = call_args.compile()
     assert str(compiled_query).startswith("SELECT tasks.id")
-    assert f"tasks.workflow_id = {workflow_id}" in str(compiled_query)
-    assert "ORDER BY tasks.sequence" in str(compiled_query)
-    assert f"LIMIT {limit}" in str(compiled_query)
-    assert f"OFFSET {skip}" in str(compiled_query)
+    assert task_id in compiled_query.params.values()
 
-
-@pytest.mark.asyncio
-async def test_get_tasks_by_workflow_empty(mock_db_session: AsyncMock):
-    """Test retrieving tasks when none exist for the workflow."""
-    workflow_id = 6
+@pytest.mark.parametrize("has_tasks", [True, False])
+async def test_get_tasks_by_workflow(mock_db_session: AsyncMock, sample_tasks: tuple[TaskModel, ...], has_tasks: bool):
+    """Test retrieving tasks for a specific workflow, with and without tasks."""
+    workflow_id = 5
     skip = 0
     limit = 10
-    mock_tasks_orm: List[TaskModel] = []
+    mock_tasks_orm: List[TaskModel] = list(sample_tasks) if has_tasks else []
+    task_count = len(mock_tasks_orm)
 
-    mock_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = mock_tasks_orm
-    mock_result.scalars.return_value = mock_scalars
-    mock_db_session.execute.return_value = mock_result
+    mock_db_session.execute.return_value = scalars_result(mock_tasks_orm)
 
     result = await task_service.get_tasks_by_workflow(
         mock_db_session, workflow_id=workflow_id, skip=skip, limit=limit
     )
 
     assert isinstance(result, list)
-    assert len(result) == 0
+    assert len(result) == task_count
+    assert [t.id for t in result] == list(range(1, task_count + 1))
+    assert {t.workflow_id for t in result} <= {workflow_id}
+
     mock_db_session.execute.assert_called_once()
+    if not task_count:
+        return
+    call_args = mock_db_session.execute.call_args[0][0]
+    sql = str(call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert sql.startswith("SELECT tasks.id")
+    assert f"tasks.workflow_id = {workflow_id}" in sql
+    assert "ORDER BY tasks.sequence" in sql
+    assert f"LIMIT {limit}" in sql
+    assert f"OFFSET {skip}" in sql
 
 # --- Test create_task ---
 
-@pytest.mark.asyncio
 async def test_create_task(mock_db_session: AsyncMock):
     """Test creating a task using TaskCreate schema."""
-    workflow_id = 7
-    task_data = TaskCreate(
-        name="Standalone Task",
-        execution_type=ExecutionTypeEnum.SYNC,
-        description="Created via TaskCreate",
-        sequence=5,
-        workflow_id=workflow_id,
-        config={"key": "value"}
-    )
+    task_data = SAMPLE_TASK_CREATE
+    workflow_id = task_data.workflow_id
 
-    async def mock_refresh(obj, attribute_names=None):
-        obj.id = 101 # Simulate DB assigning ID
-        obj.created_at = datetime.now()
-        obj.status = StatusEnum.PENDING # Simulate default
-        return None
+    returned_task = create_mock_task(id=101, workflow_id=workflow_id, name=task_data.name, sequence=task_data.sequence)
 
-    mock_db_session.refresh.side_effect = mock_refresh
+    mock_db_session.execute.return_value = scalar_result(returned_task)
 
     created_task = await task_service.create_task(mock_db_session, obj_in=task_data)
 
-    mock_db_session.add.assert_called_once()
-    added_obj = mock_db_session.add.call_args[0][0]
-    assert isinstance(added_obj, TaskModel)
-    assert added_obj.name == task_data.name
-    assert added_obj.description == task_data.description
-    assert added_obj.sequence == task_data.sequence
-    assert added_obj.workflow_id == task_data.workflow_id
-    assert added_obj.config == task_data.config
-
+    mock_db_session.execute.assert_called_once() # No separate parent-workflow lookup
+    insert_stmt = mock_db_session.execute.call_args[0][0]
+    compiled_insert = insert_stmt.compile()
+    sql = str(compiled_insert)
+    assert sql.startswith("INSERT INTO tasks")
+    assert "RETURNING tasks.id" in sql
+    params = compiled_insert.params
+    assert params["name"] == task_data.name
+    assert params["description"] == task_data.description
+    assert params["sequence"] == task_data.sequence
+    assert params["workflow_id"] == task_data.workflow_id
+    assert params["config"] == task_data.config
+
+    mock_db_session.add.assert_not_called()
     mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once_with(added_obj)
+    mock_db_session.refresh.assert_not_called()
 
-    assert created_task is added_obj
+    assert created_task is returned_task
     assert created_task.id == 101
     assert created_task.status == StatusEnum.PENDING
 
-@pytest.mark.asyncio
+async def test_create_task_parent_not_found(mock_db_session: AsyncMock):
+    """Test that a foreign key violation on insert is reported as a 404."""
+    task_data = TaskCreate(
+        name="Orphan Task",
+        execution_type=ExecutionTypeEnum.SYNC,
+        workflow_id=999
+    )
+    fk_violation = MagicMock(sqlstate=task_service.FOREIGN_KEY_VIOLATION)
+    mock_db_session.execute.side_effect = IntegrityError("INSERT INTO tasks ...", {}, fk_violation)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await task_service.create_task(mock_db_session, obj_in=task_data)
+
+    assert exc_info.value.status_code == 404
+    mock_db_session.rollback.assert_called_once()
+    mock_db_session.commit.assert_not_called()
+
 async def test_create_workflow_task(mock_db_session: AsyncMock):
     """Test creating a task using TaskCreateNested schema and workflow_id argument."""
     workflow_id = 8
@@ -193,35 +181,33 @@ async def test_create_workflow_task(mock_db_session: AsyncMock):
         config={"nested": True}
     )
 
-    async def mock_refresh(obj, attribute_names=None):
-        obj.id = 102 # Simulate DB assigning ID
-        obj.created_at = datetime.now()
-        obj.status = StatusEnum.PENDING
-        return None
+    returned_task = create_mock_task(id=102, workflow_id=workflow_id, name=task_data.name, sequence=task_data.sequence)
 
-    mock_db_session.refresh.side_effect = mock_refresh
+    mock_db_session.execute.return_value = scalar_result(returned_task)
 
     created_task = await task_service.create_workflow_task(
         mock_db_session, obj_in=task_data, workflow_id=workflow_id
     )
 
-    mock_db_session.add.assert_called_once()
-    added_obj = mock_db_session.add.call_args[0][0]
-    assert isinstance(added_obj, TaskModel)
-    assert added_obj.name == task_data.name
-    assert added_obj.description == task_data.description
-    assert added_obj.sequence == task_data.sequence
-    assert added_obj.config == task_data.config
-    assert added_obj.workflow_id == workflow_id # Verify workflow_id from arg is used
-
+    mock_db_session.execute.assert_called_once()
+    insert_stmt = mock_db_session.execute.call_args[0][0]
+    compiled_insert = insert_stmt.compile()
+    assert str(compiled_insert).startswith("INSERT INTO tasks")
+    params = compiled_insert.params
+    assert params["name"] == task_data.name
+    assert params["description"] == task_data.description
+    assert params["sequence"] == task_data.sequence
+    assert params["config"] == task_data.config
+    assert params["workflow_id"] == workflow_id # Verify workflow_id from arg is used
+
+    mock_db_session.add.assert_not_called()
     mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once_with(added_obj)
+    mock_db_session.refresh.assert_not_called()
 
-    assert created_task is added_obj
+    assert created_task is returned_task
     assert created_task.id == 102
     assert created_task.status == StatusEnum.PENDING
 
-@pytest.mark.asyncio
 async def test_update_task(mock_db_session: AsyncMock):
     """Test updating an existing task."""
     task_id = 20
@@ -242,32 +228,44 @@ async def test_update_task(mock_db_session: AsyncMock):
         # description and sequence not set, should not be updated
     )
 
-    async def mock_refresh(obj, attribute_names=None):
-        obj.updated_at = datetime.now() # Simulate DB update timestamp
-        return None
-
-    mock_db_session.refresh.side_effect = mock_refresh
+    returned_task = create_mock_task(
+        id=task_id,
+        workflow_id=workflow_id,
+        name="Updated Task Name",
+        description="Original Desc",
+        status=StatusEnum.RUNNING,
+        sequence=1,
+        config={"new_key": "new_value"},
+        updated_at=_FIXED_NOW
+    )
+    mock_db_session.execute.return_value = scalar_result(returned_task)
 
     updated_task = await task_service.update_task(
         db=mock_db_session, db_obj=existing_task, obj_in=update_data
     )
 
-    assert existing_task.name == "Updated Task Name"
-    assert existing_task.status == StatusEnum.RUNNING
-    assert existing_task.config == {"new_key": "new_value"}
-    assert existing_task.description == "Original Desc" # Unchanged
-    assert existing_task.sequence == 1 # Unchanged
-
-    mock_db_session.add.assert_called_once_with(existing_task)
+    mock_db_session.execute.assert_called_once()
+    update_stmt = mock_db_session.execute.call_args[0][0]
+    compiled_update = update_stmt.compile()
+    sql = str(compiled_update)
+    assert sql.startswith("UPDATE tasks SET")
+    assert "RETURNING tasks.id" in sql
+    assert compiled_update.params["name"] == "Updated Task Name"
+    assert compiled_update.params["status"] == StatusEnum.RUNNING
+    assert compiled_update.params["config"] == {"new_key": "new_value"}
+    assert "description" not in compiled_update.params # Unset fields are not written
+    assert "sequence" not in compiled_update.params
+    assert task_id in compiled_update.params.values()
+
+    mock_db_session.add.assert_not_called()
     mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once_with(existing_task)
+    mock_db_session.refresh.assert_not_called()
 
-    assert updated_task is existing_task
+    assert updated_task is returned_task
     assert updated_task.name == "Updated Task Name"
-    assert hasattr(updated_task, 'updated_at') # Check timestamp added
+    assert updated_task.updated_at is not None
 
 
-@pytest.mark.asyncio
 async def test_update_task_no_changes(mock_db_session: AsyncMock):
     """Test updating a task with no changes in the input schema."""
     task_id = 21
@@ -290,39 +288,34 @@ async def test_update_task_no_changes(mock_db_session: AsyncMock):
     assert existing_task.name == original_name # Unchanged
     assert existing_task.status == original_status # Unchanged
 
-    mock_db_session.add.assert_called_once_with(existing_task)
-    mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once_with(existing_task)
+    mock_db_session.execute.assert_not_called()
+    mock_db_session.commit.assert_not_called()
 
     assert updated_task is existing_task
 
 
-@patch('app.services.task_service.get_task', new_callable=AsyncMock)
-@pytest.mark.asyncio
-async def test_delete_task_found(mock_get_task: AsyncMock, mock_db_session: AsyncMock):
-    """Test deleting an existing task."""
+@pytest.fixture
+def mock_get_task(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Replaces task_service.get_task for the duration of a test."""
+    mock = AsyncMock()
+    monkeypatch.setattr(task_service, "get_task", mock)
+    return mock
+
+@pytest.mark.parametrize("found", [True, False])
+async def test_delete_task(mock_get_task: AsyncMock, mock_db_session: AsyncMock, found: bool):
+    """Test deleting a task, existing or not."""
     task_id = 30
     workflow_id = 10
-    mock_task_to_delete = create_mock_task(id=task_id, workflow_id=workflow_id, name="To Delete")
+    mock_task_to_delete = create_mock_task(id=task_id, workflow_id=workflow_id, name="To Delete") if found else None
     mock_get_task.return_value = mock_task_to_delete
 
     deleted_task = await task_service.delete_task(mock_db_session, task_id=task_id)
 
     mock_get_task.assert_called_once_with(mock_db_session, task_id)
-    mock_db_session.delete.assert_called_once_with(mock_task_to_delete)
-    mock_db_session.commit.assert_called_once()
-    assert deleted_task is mock_task_to_delete # Return the deleted object
-
-@patch('app.services.task_service.get_task', new_callable=AsyncMock)
-@pytest.mark.asyncio
-async def test_delete_task_not_found(mock_get_task: AsyncMock, mock_db_session: AsyncMock):
-    """Test deleting a non-existent task."""
-    task_id = 999
-    mock_get_task.return_value = None # Simulate task not found
-
-    deleted_task = await task_service.delete_task(mock_db_session, task_id=task_id)
-
-    mock_get_task.assert_called_once_with(mock_db_session, task_id)
-    mock_db_session.delete.assert_not_called()
-    mock_db_session.commit.assert_not_called()
-    assert deleted_task is None # Return None
\ No newline at end of file
+    if found:
+        mock_db_session.delete.assert_called_once_with(mock_task_to_delete)
+        mock_db_session.commit.assert_called_once()
+    else:
+        mock_db_session.delete.assert_not_called()
+        mock_db_session.commit.assert_not_called()
+    assert deleted_task is mock_task_to_delete # The deleted object, or None
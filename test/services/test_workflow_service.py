@@ -1,10 +1,9 @@
 import pytest
-import pytest_asyncio
-from unittest.mock import AsyncMock, MagicMock, patch, call
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from app.services import workflow_service
 from app.models.workflow import Workflow as WorkflowModel
@@ -15,82 +14,158 @@ from app.models.enums import StatusEnum
 
 from datetime import datetime
 
-@pytest.fixture
-def mock_db_session():
-    """Provides a mocked AsyncSession."""
-    session = AsyncMock(spec=AsyncSession)
-    session.execute = AsyncMock()
-    return session
+from .fakes import rows_result, scalar_result, scalars_result
 
+# Deterministic timestamp for ORM fixtures; avoids a clock read per object.
+_FIXED_NOW = datetime(2024, 1, 1, 0, 0, 0)
 
-@pytest.mark.asyncio
-async def test_get_workflow_found(mock_db_session: AsyncMock):
-    """Test retrieving an existing workflow by ID."""
-    workflow_id = 1
-    mock_workflow_orm = WorkflowModel(
-        id=workflow_id,
+# Validated once; tests that only read the schema share it.
+SAMPLE_WORKFLOW_CREATE = WorkflowCreate(
+    name="New Workflow",
+    description="Description for new workflow"
+)
+
+# Shared read-only samples; tests that mutate workflows build their own.
+@pytest.fixture(scope="module")
+def sample_workflow() -> WorkflowModel:
+    return WorkflowModel(
+        id=1,
         name="Test Workflow",
         description="A test workflow",
         status=StatusEnum.PENDING,
-        created_at=datetime.now(),
+        created_at=_FIXED_NOW,
         tasks=[]
     )
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_workflow_orm
-    mock_db_session.execute.return_value = mock_result
+@pytest.fixture(scope="module")
+def sample_workflows() -> tuple[WorkflowModel, ...]:
+    return (
+        WorkflowModel(id=1, name="WF 1", status=StatusEnum.PENDING, created_at=_FIXED_NOW, tasks=[]),
+        WorkflowModel(id=2, name="WF 2", status=StatusEnum.COMPLETED, created_at=_FIXED_NOW, tasks=[]),
+    )
+
+def _paginated_side_effect(total, items=()):
+    """
+    execute results for get_workflows: the windowed page query, whose rows carry
+    the total, then the fallback count used only when a page past the end is empty.
+    """
+    rows = [SimpleNamespace(Workflow=wf, total=total) for wf in items]
+    return [rows_result(rows), scalar_result(total)]
+
+
+@pytest.mark.parametrize("found", [True, False])
+async def test_get_workflow(mock_db_session: AsyncMock, sample_workflow: WorkflowModel, found: bool):
+    """Test retrieving a workflow by ID, existing or not."""
+    workflow_id = sample_workflow.id
+    mock_workflow_orm = sample_workflow if found else None
+
+    mock_db_session.execute.return_value = scalar_result(mock_workflow_orm)
 
     result = await workflow_service.get_workflow(mock_db_session, workflow_id=workflow_id)
 
+    mock_db_session.execute.assert_called_once()
+    if not found:
+        assert result is None
+        return
+
     assert result is not None
     assert result.id == workflow_id
     assert result.name == "Test Workflow"
     assert result.tasks == [] 
 
-    mock_db_session.execute.assert_called_once()
-
     call_args = mock_db_session.execute.call_args[0][0] 
-    assert str(call_args).startswith("SELECT workflows.id") 
-    assert workflow_id in call_args.compile().params.values()
-    assert "tasks" in str(call_args.compile()) 
+    compiled_query = call_args.compile()
+    sql = str(compiled_query)
+    assert sql.startswith("SELECT workflows.id") 
+    assert workflow_id in compiled_query.params.values()
+    # selectinload fetches tasks in a second query, so compare the whole statement, options included.
+    expected_query = select(WorkflowModel).where(WorkflowModel.id == workflow_id).options(selectinload(WorkflowModel.tasks))
+    assert call_args.compare(expected_query)
+
+async def test_get_workflow_cache_hit(mock_db_session: AsyncMock):
+    """Test that a cached workflow is returned as-is without touching the DB."""
+    cached = '{"id": 1, "name": "Cached", "tasks": []}'
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = cached
+
+    result = await workflow_service.get_workflow(mock_db_session, workflow_id=1, redis_client=mock_redis)
+
+    assert result == workflow_service.CachedJSON(cached)
+    mock_db_session.execute.assert_not_called()
+    mock_redis.set.assert_not_called()
+
+async def test_get_workflow_cache_miss_builds_json_in_sql(mock_db_session: AsyncMock):
+    """Test that a cache miss fetches the JSON payload from the DB and caches it."""
+    workflow_id = 1
+    payload = '{"name": "Test Workflow", "id": 1, "tasks": []}'
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = None
 
-@pytest.mark.asyncio
-async def test_get_workflow_not_found(mock_db_session: AsyncMock):
-    """Test retrieving a non-existent workflow by ID."""
-    workflow_id = 999
+    mock_db_session.execute.return_value = scalar_result(payload)
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_db_session.execute.return_value = mock_result
+    result = await workflow_service.get_workflow(mock_db_session, workflow_id=workflow_id, redis_client=mock_redis)
 
-    result = await workflow_service.get_workflow(mock_db_session, workflow_id=workflow_id)
+    assert result == workflow_service.CachedJSON(payload)
+    compiled_query = str(mock_db_session.execute.call_args[0][0].compile()).lower()
+    assert "json_build_object" in compiled_query
+    assert "json_agg" in compiled_query
+    mock_redis.set.assert_called_once()
+    assert mock_redis.set.call_args[0][1] == payload
+
+async def test_get_workflow_cache_miss_not_found(mock_db_session: AsyncMock):
+    """Test that a missing workflow is cached briefly as not-found."""
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = None
+
+    mock_db_session.execute.return_value = scalar_result(None)
+
+    result = await workflow_service.get_workflow(mock_db_session, workflow_id=999, redis_client=mock_redis)
 
     assert result is None
-    mock_db_session.execute.assert_called_once()
+    mock_redis.set.assert_called_once()
+    set_args, set_kwargs = mock_redis.set.call_args
+    assert set_args[1] == b"__NULL__"
+    assert set_kwargs["ex"] == workflow_service.settings.WORKFLOW_NOT_FOUND_CACHE_TTL
 
-@pytest.mark.asyncio
-async def test_get_workflows_basic(mock_db_session: AsyncMock):
+async def test_get_workflow_cached_not_found(mock_db_session: AsyncMock):
+    """Test that a cached not-found entry returns None without touching the DB."""
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = b"__NULL__"
+
+    result = await workflow_service.get_workflow(mock_db_session, workflow_id=999, redis_client=mock_redis)
+
+    assert result is None
+    mock_db_session.execute.assert_not_called()
+
+@pytest.mark.parametrize("column", [WorkflowModel.status, TaskModel.status, TaskModel.execution_type])
+def test_enum_value_maps_each_member_to_its_api_value(column):
+    """Test that the SQL JSON maps stored member names to values without assuming value == name.lower()."""
+    compiled = workflow_service._enum_value(column).compile()
+    params = list(compiled.params.values())
+    # Each WHEN compares against a member and is followed by that member's THEN value.
+    assert list(zip(params[::2], params[1::2])) == [(member, member.value) for member in column.type.enum_class]
+
+@pytest.mark.parametrize("scalar, expected", [(1, True), (None, False)])
+async def test_workflow_exists(mock_db_session: AsyncMock, scalar, expected):
+    """Test the existence check selects a constant rather than the workflow row."""
+    mock_db_session.execute.return_value = scalar_result(scalar)
+
+    assert await workflow_service.workflow_exists(mock_db_session, workflow_id=3) is expected
+
+    query = mock_db_session.execute.call_args[0][0]
+    compiled_query = str(query.compile(compile_kwargs={"literal_binds": True}))
+    assert compiled_query.startswith("SELECT 1")
+    assert "tasks" not in compiled_query
+
+async def test_get_workflows_basic(mock_db_session: AsyncMock, sample_workflows: tuple[WorkflowModel, ...]):
     """Test retrieving a paginated list of workflows."""
     skip = 0
     limit = 2
     total_count = 5
 
-    mock_workflow_1 = WorkflowModel(id=1, name="WF 1", status=StatusEnum.PENDING, created_at=datetime.now(), tasks=[])
-    mock_workflow_2 = WorkflowModel(id=2, name="WF 2", status=StatusEnum.COMPLETED, created_at=datetime.now(), tasks=[])
-    mock_items = [mock_workflow_1, mock_workflow_2]
-
-    mock_count_result = MagicMock()
-    mock_count_result.scalar_one.return_value = total_count
+    mock_items = sample_workflows
 
-    mock_items_result = MagicMock()
-    mock_items_scalars = MagicMock()
-    mock_items_scalars.all.return_value = mock_items
-    mock_items_result.scalars.return_value = mock_items_scalars 
-
-    mock_db_session.execute.side_effect = [
-        mock_count_result,  
-        mock_items_result   
-    ]
+    mock_db_session.execute.side_effect = _paginated_side_effect(total_count, mock_items)
 
     result_page = await workflow_service.get_workflows(mock_db_session, skip=skip, limit=limit)
 
@@ -103,35 +178,23 @@ async def test_get_workflows_basic(mock_db_session: AsyncMock):
     assert result_page.total == total_count
     assert result_page.pages == 3 
 
-    assert mock_db_session.execute.call_count == 2
-
-    count_call_args = mock_db_session.execute.call_args_list[0][0][0]
-    assert "count(workflows.id)" in str(count_call_args.compile()).lower()
+    mock_db_session.execute.assert_called_once()
 
-    items_call_args = mock_db_session.execute.call_args_list[1][0][0]
-    compiled_items_query = items_call_args.compile(compile_kwargs={"literal_binds": True}) 
-    assert f"LIMIT {limit}" in str(compiled_items_query)
-    assert f"OFFSET {skip}" in str(compiled_items_query)
-    assert "ORDER BY workflows.id" in str(compiled_items_query)
-    assert "tasks" in str(compiled_items_query) 
+    items_call_args = mock_db_session.execute.call_args[0][0]
+    # Lowered once; every check below runs against the same string.
+    sql = str(items_call_args.compile(compile_kwargs={"literal_binds": True})).lower()
+    assert "count(*) over ()" in sql
+    assert f"limit {limit}" in sql
+    assert f"offset {skip}" in sql
+    assert "order by workflows.id" in sql
+    assert "tasks" not in sql
 
-@pytest.mark.asyncio
 async def test_get_workflows_empty(mock_db_session: AsyncMock):
     """Test retrieving workflows when there are none."""
     skip = 0
     limit = 10
-    total_count = 0
-    mock_items = []
 
-    mock_count_result = MagicMock()
-    mock_count_result.scalar_one.return_value = total_count
-
-    mock_items_result = MagicMock()
-    mock_items_scalars = MagicMock()
-    mock_items_scalars.all.return_value = mock_items
-    mock_items_result.scalars.return_value = mock_items_scalars
-
-    mock_db_session.execute.side_effect = [mock_count_result, mock_items_result]
+    mock_db_session.execute.side_effect = _paginated_side_effect(0)
 
     result_page = await workflow_service.get_workflows(mock_db_session, skip=skip, limit=limit)
 
@@ -142,71 +205,109 @@ async def test_get_workflows_empty(mock_db_session: AsyncMock):
     assert result_page.total == 0
     assert result_page.pages == 0 
 
+    mock_db_session.execute.assert_called_once()
+
+async def test_get_workflows_past_last_page(mock_db_session: AsyncMock):
+    """Test that an empty page past the end still reports the total via a count query."""
+    skip = 10
+    limit = 5
+    total_count = 3
+
+    mock_db_session.execute.side_effect = _paginated_side_effect(total_count)
+
+    result_page = await workflow_service.get_workflows(mock_db_session, skip=skip, limit=limit)
+
+    assert len(result_page.items) == 0
+    assert result_page.total == total_count
+    assert result_page.pages == 1
+
     assert mock_db_session.execute.call_count == 2
+    count_call_args = mock_db_session.execute.call_args_list[1][0][0]
+    count_sql = str(count_call_args.compile()).lower()
+    assert "count(workflows.id)" in count_sql
 
-@pytest.mark.asyncio
 async def test_get_workflows_invalid_pagination(mock_db_session: AsyncMock):
     """Test if invalid skip/limit are corrected."""
     skip = -5
     limit = 0
     corrected_skip = 0
     corrected_limit = 100 
-    total_count = 10
 
-    mock_count_result = MagicMock()
-    mock_count_result.scalar_one.return_value = total_count
-    mock_items_result = MagicMock()
-    mock_items_scalars = MagicMock()
-    mock_items_scalars.all.return_value = [] 
-    mock_items_result.scalars.return_value = mock_items_scalars
-
-    mock_db_session.execute.side_effect = [mock_count_result, mock_items_result]
+    mock_db_session.execute.side_effect = _paginated_side_effect(0)
 
     await workflow_service.get_workflows(mock_db_session, skip=skip, limit=limit)
 
-    items_call_args = mock_db_session.execute.call_args_list[1][0][0]
-    compiled_items_query = items_call_args.compile(compile_kwargs={"literal_binds": True})
-    assert f"LIMIT {corrected_limit}" in str(compiled_items_query)
-    assert f"OFFSET {corrected_skip}" in str(compiled_items_query)
+    items_call_args = mock_db_session.execute.call_args_list[0][0][0]
+    sql = str(items_call_args.compile(compile_kwargs={"literal_binds": True}))
+    assert f"LIMIT {corrected_limit}" in sql
+    assert f"OFFSET {corrected_skip}" in sql
+
+async def test_get_workflows_cache_hit(mock_db_session: AsyncMock):
+    """Test that a cached page for the current list generation is returned without touching the DB."""
+    cached = b'{"items": [], "page": 1, "size": 10, "total": 0, "pages": 0}'
+    mock_redis = AsyncMock()
+    mock_redis.get.side_effect = [b"3", cached]
+
+    result = await workflow_service.get_workflows(mock_db_session, skip=0, limit=10, redis_client=mock_redis)
+
+    assert result == workflow_service.CachedJSON(cached)
+    assert [c.args[0] for c in mock_redis.get.call_args_list] == ["wl:gen", "wl:3:0:10"]
+    mock_db_session.execute.assert_not_called()
+    mock_redis.set.assert_not_called()
+
+async def test_get_workflows_cache_miss(mock_db_session: AsyncMock, sample_workflows: tuple[WorkflowModel, ...]):
+    """Test that a miss queries the DB and caches the page under the current generation."""
+    mock_redis = AsyncMock()
+    mock_redis.get.side_effect = [None, None] # No write yet, so generation 0
+    mock_db_session.execute.side_effect = _paginated_side_effect(5, sample_workflows)
+
+    result = await workflow_service.get_workflows(mock_db_session, skip=0, limit=2, redis_client=mock_redis)
+
+    assert isinstance(result, Page)
+    assert result.total == 5
+    mock_db_session.execute.assert_called_once()
+    mock_redis.set.assert_called_once()
+    set_args, set_kwargs = mock_redis.set.call_args
+    assert set_args[0] == "wl:0:0:2"
+    assert set_args[1] == workflow_service._workflow_page_adapter.dump_json(result)
+    assert set_kwargs["ex"] == workflow_service.settings.WORKFLOW_CACHE_TTL
 
 
-@pytest.mark.asyncio
 async def test_create_workflow(mock_db_session: AsyncMock):
     """Test creating a new workflow."""
-    workflow_data = WorkflowCreate(
-        name="New Workflow",
-        description="Description for new workflow"
-    )
-
-    async def mock_refresh(obj, attribute_names=None):
-        obj.id = 123 
-        obj.created_at = datetime.now()
-        obj.status = StatusEnum.PENDING 
-        obj.tasks = [] 
-        return None
+    workflow_data = SAMPLE_WORKFLOW_CREATE
 
-    mock_db_session.refresh = AsyncMock(side_effect=mock_refresh)
-    mock_db_session.commit = AsyncMock()
-    mock_db_session.add = MagicMock() 
+    returned_workflow = WorkflowModel(
+        id=123,
+        name=workflow_data.name,
+        description=workflow_data.description,
+        status=StatusEnum.PENDING,
+        created_at=_FIXED_NOW,
+    )
+    mock_db_session.execute.return_value = scalar_result(returned_workflow)
 
     created_workflow = await workflow_service.create_workflow(mock_db_session, obj_in=workflow_data)
 
-    mock_db_session.add.assert_called_once()
-    added_obj = mock_db_session.add.call_args[0][0] 
-    assert isinstance(added_obj, WorkflowModel)
-    assert added_obj.name == workflow_data.name
-    assert added_obj.description == workflow_data.description
-
+    mock_db_session.execute.assert_called_once()
+    insert_stmt = mock_db_session.execute.call_args[0][0]
+    compiled_insert = insert_stmt.compile()
+    sql = str(compiled_insert)
+    assert sql.startswith("INSERT INTO workflows")
+    assert "RETURNING workflows.id" in sql
+    assert compiled_insert.params["name"] == workflow_data.name
+    assert compiled_insert.params["description"] == workflow_data.description
+
+    mock_db_session.add.assert_not_called()
     mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once_with(added_obj) 
+    mock_db_session.refresh.assert_not_called()
 
-    assert created_workflow is added_obj 
+    assert created_workflow is returned_workflow 
     assert created_workflow.id == 123
     assert created_workflow.status == StatusEnum.PENDING
     assert created_workflow.name == workflow_data.name
+    assert created_workflow.tasks == []
 
 
-@pytest.mark.asyncio
 async def test_update_workflow(mock_db_session: AsyncMock):
     """Test updating an existing workflow."""
     existing_workflow_id = 1
@@ -215,7 +316,7 @@ async def test_update_workflow(mock_db_session: AsyncMock):
         name="Original Name",
         description="Original Desc",
         status=StatusEnum.PENDING,
-        created_at=datetime.now(),
+        created_at=_FIXED_NOW,
         tasks=[]
     )
 
@@ -225,16 +326,7 @@ async def test_update_workflow(mock_db_session: AsyncMock):
 
     )
 
-    async def mock_refresh(obj, attribute_names=None):
-        if attribute_names and 'tasks' in attribute_names:
-            if not hasattr(obj, 'tasks'):
-                 obj.tasks = [] 
-        obj.updated_at = datetime.now() 
-        return None
-
-    mock_db_session.commit = AsyncMock()
-    mock_db_session.refresh = AsyncMock(side_effect=mock_refresh)
-    mock_db_session.add = MagicMock() 
+    mock_db_session.execute.return_value = scalar_result(existing_workflow)
 
     updated_workflow = await workflow_service.update_workflow(
         db=mock_db_session, db_obj=existing_workflow, obj_in=update_data
@@ -246,28 +338,26 @@ async def test_update_workflow(mock_db_session: AsyncMock):
 
     mock_db_session.add.assert_called_once_with(existing_workflow)
     mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_has_calls([
-        call(existing_workflow), 
-        call(existing_workflow, attribute_names=['tasks']) 
-    ], any_order=False) 
+    mock_db_session.refresh.assert_not_called()
+
+    mock_db_session.execute.assert_called_once()
+    reload_query = mock_db_session.execute.call_args[0][0]
+    assert str(reload_query).startswith("SELECT workflows.id")
+    assert existing_workflow_id in reload_query.compile().params.values()
 
     assert updated_workflow is existing_workflow
     assert updated_workflow.name == "Updated Name"
     assert updated_workflow.status == StatusEnum.RUNNING
-    assert hasattr(updated_workflow, 'updated_at') 
     assert hasattr(updated_workflow, 'tasks') 
 
-@pytest.mark.asyncio
 async def test_update_workflow_no_changes(mock_db_session: AsyncMock):
     """Test update when input schema has no fields set."""
     existing_workflow = WorkflowModel(
-        id=2, name="No Change", status=StatusEnum.PENDING, created_at=datetime.now(), tasks=[]
+        id=2, name="No Change", status=StatusEnum.PENDING, created_at=_FIXED_NOW, tasks=[]
     )
     update_data = WorkflowUpdate() 
 
-    mock_db_session.commit = AsyncMock()
-    mock_db_session.refresh = AsyncMock()
-    mock_db_session.add = MagicMock()
+    mock_db_session.execute.return_value = scalar_result(existing_workflow)
 
     original_name = existing_workflow.name 
 
@@ -279,41 +369,43 @@ async def test_update_workflow_no_changes(mock_db_session: AsyncMock):
 
     mock_db_session.add.assert_called_once_with(existing_workflow)
     mock_db_session.commit.assert_called_once()
-    assert mock_db_session.refresh.call_count == 2
+    mock_db_session.refresh.assert_not_called()
+    mock_db_session.execute.assert_called_once()
 
     assert updated_workflow is existing_workflow
 
-@patch('app.services.workflow_service.get_workflow', new_callable=AsyncMock)
-@pytest.mark.asyncio
-async def test_delete_workflow_found(mock_get_workflow: AsyncMock, mock_db_session: AsyncMock):
-    """Test deleting an existing workflow."""
+@pytest.mark.parametrize("found", [True, False])
+async def test_delete_workflow(mock_db_session: AsyncMock, found: bool):
+    """Test deleting a workflow, existing or not."""
     workflow_id = 5
-    mock_workflow_to_delete = WorkflowModel(id=workflow_id, name="To Delete")
-    mock_get_workflow.return_value = mock_workflow_to_delete
+    mock_workflow_to_delete = WorkflowModel(id=workflow_id, name="To Delete") if found else None
+    # RETURNING rows come back unordered
+    deleted_tasks = [
+        TaskModel(id=2, workflow_id=workflow_id, name="Second", sequence=2),
+        TaskModel(id=1, workflow_id=workflow_id, name="First", sequence=1),
+    ] if found else []
 
-    mock_db_session.delete = AsyncMock()
-    mock_db_session.commit = AsyncMock()
+    mock_db_session.execute.side_effect = [scalars_result(deleted_tasks), scalar_result(mock_workflow_to_delete)]
 
     deleted_workflow = await workflow_service.delete_workflow(mock_db_session, workflow_id=workflow_id)
 
-    mock_get_workflow.assert_called_once_with(mock_db_session, workflow_id)
-    mock_db_session.delete.assert_called_once_with(mock_workflow_to_delete)
-    mock_db_session.commit.assert_called_once()
-    assert deleted_workflow is mock_workflow_to_delete 
-
-@patch('app.services.workflow_service.get_workflow', new_callable=AsyncMock)
-@pytest.mark.asyncio
-async def test_delete_workflow_not_found(mock_get_workflow: AsyncMock, mock_db_session: AsyncMock):
-    """Test deleting a non-existent workflow."""
-    workflow_id = 999
-    mock_get_workflow.return_value = None
-
-    mock_db_session.delete = AsyncMock()
-    mock_db_session.commit = AsyncMock()
-
-    deleted_workflow = await workflow_service.delete_workflow(mock_db_session, workflow_id=workflow_id)
-
-    mock_get_workflow.assert_called_once_with(mock_db_session, workflow_id)
+    assert mock_db_session.execute.call_count == 2
     mock_db_session.delete.assert_not_called()
-    mock_db_session.commit.assert_not_called()
-    assert deleted_workflow is None 
\ No newline at end of file
+    assert deleted_workflow is mock_workflow_to_delete # The deleted object, or None
+    if not found:
+        mock_db_session.commit.assert_not_called()
+        return
+
+    mock_db_session.commit.assert_called_once()
+    assert [task.id for task in deleted_workflow.tasks] == [1, 2]
+
+    task_delete_stmt = mock_db_session.execute.call_args_list[0][0][0]
+    compiled_task_delete = str(task_delete_stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert compiled_task_delete.startswith("DELETE FROM tasks")
+    assert f"tasks.workflow_id = {workflow_id}" in compiled_task_delete
+
+    delete_stmt = mock_db_session.execute.call_args[0][0]
+    compiled_delete = str(delete_stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert compiled_delete.startswith("DELETE FROM workflows")
+    assert f"workflows.id = {workflow_id}" in compiled_delete
+    assert "RETURNING workflows.id" in compiled_delete